@@ -0,0 +1,48 @@
+'''Measure peak RSS and wall time of converting a pdf with ``Converter.convert()``.
+
+Run it in a fresh process per measurement, since peak RSS is a process-wide high-water mark.
+``--root`` imports ``pdf2docx_custom`` from another checkout, e.g. a ``git worktree`` of an earlier
+commit, so as to compare before/after a change with the same script.
+
+Usage::
+
+    python benchmarks/bench_convert.py [--pdf input/113Q3.pdf] [--root .]
+'''
+
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+
+
+def _max_rss_mb():
+    '''Peak resident set size of current process in MB (``ru_maxrss`` is in KB on Linux).'''
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024*1024) if sys.platform=='darwin' else rss / 1024
+
+
+def main(filename:str, root:str):
+    sys.path.insert(0, os.path.abspath(root))
+    from pdf2docx_custom import Converter
+
+    rss_before = _max_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        cv = Converter(filename)
+        cv.convert(os.path.join(tmp, 'output.docx'))
+        cv.close()
+        elapsed = time.perf_counter() - t0
+
+    rss_after = _max_rss_mb()
+    print(f'peak RSS: {rss_after:.1f} MB ({rss_after-rss_before:+.1f} MB by converting), '
+          f'time: {elapsed:.2f} s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pdf', default=os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf'))
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(__file__), '..'))
+    args = parser.parse_args()
+    main(os.path.abspath(args.pdf), args.root)
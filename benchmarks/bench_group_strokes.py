@@ -0,0 +1,118 @@
+'''Benchmark grouping lattice table strokes into rows/columns: the original first-match scan against
+``TableStructure._group_h_v_strokes()``, on synthetic grids drawn in shuffled order.
+
+Usage::
+
+    python benchmarks/bench_group_strokes.py [--rows 200] [--cols 50] [--repeat 3]
+'''
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pdf2docx_custom.common.Element import Element
+from pdf2docx_custom.shape.Shape import Stroke
+from pdf2docx_custom.shape.Shapes import Shapes
+from pdf2docx_custom.table.TableStructure import TableStructure
+
+MIN_BORDER_CLEARANCE = 2.0
+MAX_BORDER_WIDTH = 6.0
+
+
+def group_h_v_strokes_by_scan(strokes:Shapes, min_border_clearance:float, max_border_width:float):
+    '''The original implementation: each stroke joins the first group close enough.'''
+    def group_strokes(stroke, strokes:dict):
+        t = round(stroke.y0, 1) if stroke.horizontal else round(stroke.x0, 1)
+        for t_ in strokes:
+            if abs(t-t_)>min_border_clearance: continue
+            t = (t_+t)/2.0 # average
+            strokes[t] = strokes.pop(t_)
+            strokes[t].append(stroke)
+            break
+        else:
+            strokes[t] = Shapes([stroke])
+
+    h_strokes, v_strokes = {}, {}
+    X0, Y0, X1, Y1 = float('inf'), float('inf'), -float('inf'), -float('inf')
+    for stroke in strokes:
+        group_strokes(stroke, h_strokes if stroke.horizontal else v_strokes)
+        X0 = min(X0, stroke.x0)
+        X1 = max(X1, stroke.x1)
+        Y0 = min(Y0, stroke.y0)
+        Y1 = max(Y1, stroke.y1)
+
+    if not h_strokes or not v_strokes: return None, None
+
+    table_bbox = Element().update_bbox((X0, Y0, X1, Y1))
+    TableStructure._check_outer_strokes(table_bbox, h_strokes, 'top', max_border_width)
+    TableStructure._check_outer_strokes(table_bbox, h_strokes, 'bottom', max_border_width)
+    TableStructure._check_outer_strokes(table_bbox, v_strokes, 'left', max_border_width)
+    TableStructure._check_outer_strokes(table_bbox, v_strokes, 'right', max_border_width)
+
+    for _, borders in h_strokes.items(): borders.sort_in_line_order()
+    for _, borders in v_strokes.items(): borders.sort_in_reading_order()
+    return h_strokes, v_strokes
+
+
+def grid_strokes(rows:int, cols:int, seed:int=0):
+    '''Border strokes of a ``rows x cols`` grid: each cell side is drawn in two segments, with
+    jitter within the clearance, e.g. different stroke widths.'''
+    rng = random.Random(seed)
+    w, h = 10.0, 5.0
+    jitter = lambda: rng.uniform(0, MIN_BORDER_CLEARANCE/2.0)
+    strokes = []
+    for i in range(rows+1):
+        for j in range(cols):
+            x, y = j*w, i*h
+            for x0, x1 in ((x, x+w/2), (x+w/2, x+w)):
+                y_ = y+jitter()
+                strokes.append(Stroke({'start': (x0, y_), 'end': (x1, y_), 'width': 1.0}))
+    for j in range(cols+1):
+        for i in range(rows):
+            x, y = j*w, i*h
+            for y0, y1 in ((y, y+h/2), (y+h/2, y+h)):
+                x_ = x+jitter()
+                strokes.append(Stroke({'start': (x_, y0), 'end': (x_, y1), 'width': 1.0}))
+    rng.shuffle(strokes) # drawing order is not sorted
+    return strokes
+
+
+def _groups(strokes:dict):
+    return [(k, sorted(tuple(stroke.bbox) for stroke in strokes[k])) for k in sorted(strokes)]
+
+
+def _best_time(func, repeat:int):
+    best, res = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = func()
+        best = min(best, time.perf_counter()-t0)
+    return best, res
+
+
+def main(rows:int, cols:int, repeat:int):
+    strokes = Shapes(grid_strokes(rows, cols))
+    t_scan, (h0, v0) = _best_time(lambda: group_h_v_strokes_by_scan(
+        strokes, MIN_BORDER_CLEARANCE, MAX_BORDER_WIDTH), repeat)
+    t_sort, (h1, v1) = _best_time(lambda: TableStructure._group_h_v_strokes(
+        strokes, MIN_BORDER_CLEARANCE, MAX_BORDER_WIDTH), repeat)
+
+    same = _groups(h0)==_groups(h1) and _groups(v0)==_groups(v1)
+    print(f'{rows}x{cols} grid, {len(strokes)} strokes, {len(h1)} rows / {len(v1)} columns')
+    print(f'original scan : {t_scan*1000:8.1f} ms')
+    print(f'sort & cluster: {t_sort*1000:8.1f} ms ({t_scan/t_sort:.1f}x)')
+    print(f'identical keys and groups: {same}')
+    return same
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--cols', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(0 if main(args.rows, args.cols, args.repeat) else 1)
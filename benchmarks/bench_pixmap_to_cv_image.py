@@ -0,0 +1,58 @@
+'''Benchmark converting pixmaps to opencv images: the original png encoding and decoding round
+trip against ``ImagesExtractor._pixmap_to_cv_image()`` viewing the samples directly.
+
+Pixmaps are rendered from pages of the sample pdf, with and without alpha channel.
+
+Usage::
+
+    python benchmarks/bench_pixmap_to_cv_image.py [--pdf input/113Q3.pdf] [--zoom 2] [--repeat 3]
+'''
+
+import os
+import sys
+import time
+import argparse
+import cv2 as cv
+import fitz
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pdf2docx_custom.image.ImagesExtractor import ImagesExtractor
+
+
+def pixmap_to_cv_image_by_png(pixmap:fitz.Pixmap):
+    '''The original implementation.'''
+    return cv.imdecode(np.frombuffer(pixmap.tobytes(), np.uint8), cv.IMREAD_COLOR)
+
+
+def _best_time(func, repeat:int):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter()-t0)
+    return best
+
+
+def main(filename:str, zoom:float, repeat:int):
+    with fitz.Document(filename) as doc:
+        for alpha in (False, True):
+            pixmaps = [page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=alpha) for page in doc]
+            t_png = _best_time(lambda: [pixmap_to_cv_image_by_png(pixmap) for pixmap in pixmaps], repeat)
+            t_view = _best_time(lambda: [ImagesExtractor._pixmap_to_cv_image(pixmap) for pixmap in pixmaps], repeat)
+
+            n = len(pixmaps)
+            w, h = pixmaps[0].width, pixmaps[0].height
+            print(f'{n} pixmaps of {w}x{h}, alpha={alpha}')
+            print(f'  png round trip: {t_png*1e3/n:8.2f} ms per pixmap')
+            print(f'  direct view   : {t_view*1e3/n:8.2f} ms per pixmap ({t_png/t_view:.0f}x)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pdf', default=os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf'))
+    parser.add_argument('--zoom', type=float, default=2.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.pdf, args.zoom, args.repeat)
@@ -0,0 +1,124 @@
+'''Benchmark splitting text spans by text style shapes: the original ``copy()`` path deep copying
+the whole span for each part against ``TextSpan.split()`` with ``TextSpan._slice()``.
+
+Spans with most chars are extracted from the sample pdf, and each one is split by underlines
+covering its head, middle and tail respectively.
+
+Usage::
+
+    python benchmarks/bench_split_span.py [--pdf input/113Q3.pdf] [--spans 100] [--repeat 3]
+'''
+
+import os
+import sys
+import time
+import argparse
+import fitz
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pdf2docx_custom.shape.Shape import Stroke
+from pdf2docx_custom.text.TextSpan import TextSpan
+
+
+def split_by_copy(span:TextSpan, rect, horizontal:bool=True):
+    '''The original ``TextSpan.split()``: each part is a deep copy with sliced chars.'''
+    intsec = rect.bbox & span.bbox
+    if intsec.is_empty: return [span]
+
+    split_spans = []
+    if horizontal:
+        intsec.y0 = span.bbox.y0
+        intsec.y1 = span.bbox.y1
+    else:
+        intsec.x0 = span.bbox.x0
+        intsec.x1 = span.bbox.x1
+
+    f = lambda items: items[1].contained_in_rect(rect, horizontal)
+    index_chars = list(filter(f, enumerate(span.chars)))
+    pos = index_chars[0][0] if index_chars else -1
+    length = len(index_chars)
+    pos_end = max(pos+length, 0)
+
+    if pos > 0:
+        if horizontal:
+            bbox = (span.bbox.x0, span.bbox.y0, intsec.x0, span.bbox.y1)
+        else:
+            bbox = (span.bbox.x0, intsec.y1, span.bbox.x1, span.bbox.y1)
+        split_span = span.copy().update_bbox(bbox)
+        split_span.chars = span.chars[0:pos]
+        split_spans.append(split_span)
+
+    if length > 0:
+        bbox = (intsec.x0, intsec.y0, intsec.x1, intsec.y1)
+        split_span = span.copy().update_bbox(bbox)
+        split_span.chars = span.chars[pos:pos_end]
+        split_span._parse_text_format(rect, horizontal)
+        split_spans.append(split_span)
+
+    if pos_end < len(span.chars):
+        if horizontal:
+            bbox = (intsec.x1, span.bbox.y0, span.bbox.x1, span.bbox.y1)
+        else:
+            bbox = (span.bbox.x0, span.bbox.y0, span.bbox.x1, intsec.y0)
+        split_span = span.copy().update_bbox(bbox)
+        split_span.chars = span.chars[pos_end:]
+        split_spans.append(split_span)
+
+    return split_spans
+
+
+def load_spans(filename:str, num:int):
+    '''Horizontal spans with most chars.'''
+    spans = []
+    with fitz.Document(filename) as doc:
+        for page in doc:
+            for block in page.get_text('rawdict')['blocks']:
+                for line in block.get('lines', []):
+                    if line['dir']==(1.0, 0.0): spans.extend(line['spans'])
+    spans.sort(key=lambda span: len(span['chars']), reverse=True)
+    return [TextSpan(raw) for raw in spans[:num]]
+
+
+def cases(spans:list):
+    '''(span, underline) pairs splitting each span at head, middle and tail.'''
+    res = []
+    for span in spans:
+        x0, _, x1, y1 = span.bbox
+        w = x1-x0
+        for a, b in ((0.0, 0.3), (0.35, 0.65), (0.7, 1.0)):
+            res.append((span, Stroke({'start': (x0+a*w, y1), 'end': (x0+b*w, y1), 'width': 0.5})))
+    return res
+
+
+def _best_time(func, repeat:int):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter()-t0)
+    return best
+
+
+def main(filename:str, num:int, repeat:int):
+    spans = load_spans(filename, num)
+    pairs = cases(spans)
+    chars = sum(len(span.chars) for span in spans) / len(spans)
+
+    # Note the rect type is set when splitting, so it doesn't matter that rects are reused
+    t_copy = _best_time(lambda: [split_by_copy(span, rect) for span, rect in pairs], repeat)
+    t_slice = _best_time(lambda: [span.split(rect) for span, rect in pairs], repeat)
+
+    n = len(pairs)
+    print(f'{len(spans)} spans, {chars:.1f} chars per span on average, {n} splits')
+    print(f'copy()  : {t_copy*1e6/n:9.1f} us per split')
+    print(f'_slice(): {t_slice*1e6/n:9.1f} us per split ({t_copy/t_slice:.0f}x)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pdf', default=os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf'))
+    parser.add_argument('--spans', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.pdf, args.spans, args.repeat)
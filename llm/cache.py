@@ -0,0 +1,116 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+
+class LLMCache:
+    """
+    以內容雜湊為 key 的 LLM 回應快取，儲存在 SQLite。
+    key 由 (model_name, prompt, 圖片內容, max_tokens) 計算，圖片路徑或檔名不同但內容相同時可共用結果。
+    """
+    def __init__(self, path="./.llm_cache/responses.sqlite3", max_entries=10000, ttl=30 * 24 * 3600):
+        """
+        Args:
+            path (str)        : SQLite 檔案路徑
+            max_entries (int) : 最多保留的筆數，超過時刪除最久未使用的記錄；None 表示不限制
+            ttl (float)       : 記錄的有效秒數，過期即視為不存在；None 表示永不過期
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+
+    @contextmanager
+    def _connect(self):
+        # 每次操作建立新連線，讓多個執行緒可同時使用同一個快取
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(model_name, prompt, image_path=None, max_tokens=None):
+        """
+        計算快取 key：sha256(model_name, prompt, 圖片 bytes, max_tokens)。
+        image_path 可為單一路徑或路徑 list。
+        """
+        digest = hashlib.sha256()
+        for part in (model_name, prompt, max_tokens):
+            value = str(part).encode("utf-8")
+            digest.update(len(value).to_bytes(8, "big"))
+            digest.update(value)
+        if not image_path:
+            image_paths = []
+        elif isinstance(image_path, (list, tuple)):
+            image_paths = image_path
+        else:
+            image_paths = [image_path]
+        for path in image_paths:
+            with open(path, "rb") as image_file:
+                image = image_file.read()
+            digest.update(len(image).to_bytes(8, "big"))
+            digest.update(image)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        取得快取的回應；不存在或已過期時回傳 None。
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return response
+
+    def set(self, key, response):
+        """
+        寫入回應，並依 TTL 與 max_entries 清除舊記錄。
+        """
+        if response is None:
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        if self.ttl is not None:
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        if self.max_entries is not None:
+            conn.execute(
+                """DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        """
+        清空所有快取記錄。
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
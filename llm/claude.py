@@ -4,19 +4,28 @@ from dotenv import load_dotenv
 import anthropic
 import PIL.Image
 from llm.llm import LLM
+from llm.ratelimit import estimate_tokens
 
-class CLAUDE(LLM):      
-    def generate(self, prompt="", image_path=None, model_name="claude-3-5-sonnet-20241022"):
-        client = anthropic.Client(
+class CLAUDE(LLM):
+    requests_per_minute = 50
+    tokens_per_minute = 40000
+
+    def _create_client(self, model_name=None):
+        # anthropic client 可跨執行緒使用，內部的 httpx 連線池會保持 keep-alive
+        return anthropic.Client(
             api_key=self.api_key,
+            base_url=self.base_url,
         )
 
-        messages = []
-
-        if image_path:
-            with open(image_path, "rb") as image_file:
+    def build_content(self, prompt="", image_path=None):
+        """
+        組出單一 user message 的 content：依序附上圖片，最後是文字 prompt。
+        """
+        content = []
+        for path in self.image_paths(image_path):
+            with open(path, "rb") as image_file:
                 image = base64.b64encode(image_file.read()).decode("utf-8")
-                messages.append({
+                content.append({
                     "type": "image",
                     "source": {
                         "type": "base64",
@@ -24,14 +33,29 @@ class CLAUDE(LLM):
                         "data": image,
                     },
                 })
-        messages.append({
+        content.append({
             "type": "text",
             "text": prompt
         })
+        return content
+
+    def generate(self, prompt="", image_path=None, model_name="claude-3-5-sonnet-20241022", max_tokens=1024, use_cache=True):
+        use_cache = use_cache and bool(self.cache)
+        if use_cache:
+            cache_key = self.cache.make_key(model_name, prompt, image_path, max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        self.rate_limiter.acquire(estimate_tokens(prompt, image_path))
+
+        client = self.get_client()
+
+        messages = self.build_content(prompt, image_path)
         try:
             response = client.messages.create(
                 model=model_name,
-                max_tokens=1024,
+                max_tokens=max_tokens,
                 messages=[
                     {
                         "role": "user",
@@ -41,10 +65,48 @@ class CLAUDE(LLM):
             )
             print(response.content)
             extracted_text = "".join(block.text for block in response.content if hasattr(block, "text"))
+            if use_cache:
+                self.cache.set(cache_key, extracted_text)
             return extracted_text
         except Exception as e:
             print(f"Error: {e}")
-        
+
+    def generate_stream(self, prompt="", image_path=None, model_name="claude-3-5-sonnet-20241022", max_tokens=1024, max_continuations=5, use_cache=True):
+        """
+        以串流方式產生回應，逐段 yield 文字。
+        若輸出因 max_tokens 被截斷，會把目前的輸出當成 assistant 的開頭請模型接續，最多 max_continuations 次。
+        """
+        use_cache = use_cache and bool(self.cache)
+        if use_cache:
+            cache_key = self.cache.make_key(model_name, prompt, image_path, (max_tokens, max_continuations))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        client = self.get_client()
+        messages = [{
+            "role": "user",
+            "content": self.build_content(prompt, image_path),
+        }]
+        extracted_text = ""
+        for _ in range(max_continuations + 1):
+            self.rate_limiter.acquire(estimate_tokens(prompt, image_path))
+            # assistant 的開頭不能以空白結尾，被去掉的空白已經輸出過，不需重複
+            prefill = extracted_text.rstrip()
+            request_messages = messages + [{"role": "assistant", "content": prefill}] if prefill else messages
+            with client.messages.stream(model=model_name, max_tokens=max_tokens, messages=request_messages) as stream:
+                for text in stream.text_stream:
+                    extracted_text += text
+                    yield text
+                stop_reason = stream.get_final_message().stop_reason
+            if stop_reason != "max_tokens":
+                break
+            print("Output reached max_tokens, continuing...")
+
+        if use_cache:
+            self.cache.set(cache_key, extracted_text)
+
 
 if __name__ == "__main__":
     load_dotenv()
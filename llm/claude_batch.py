@@ -0,0 +1,147 @@
+import json
+import time
+from llm.claude import CLAUDE
+
+
+class CLAUDEBatch(CLAUDE):
+    """
+    透過 Anthropic Message Batches API 一次送出大量請求，適合離線的大量處理。
+    用法：add_request() 加入所有請求 -> run() 送出並等待完成 -> 取得 {key: 回應文字}。
+    請求超過單一 batch 的數量或大小上限時會拆成多個 batch 送出，並一起輪詢。
+    設定 base_url 可改連本機的假伺服器做測試。
+    """
+    # 單一 batch 的上限為 100,000 個請求或 256 MB，大小保留一些餘裕給 HTTP 請求本身
+    max_batch_requests = 100000
+    max_batch_bytes = 200 * 1024 * 1024
+
+    def __init__(self, api_key, cache=None, base_url=None, model_name="claude-3-5-sonnet-20241022", max_tokens=1024, poll_interval=60,
+                 max_batch_requests=None, max_batch_bytes=None):
+        super().__init__(api_key, cache, base_url)
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.poll_interval = poll_interval
+        if max_batch_requests:
+            self.max_batch_requests = max_batch_requests
+        if max_batch_bytes:
+            self.max_batch_bytes = max_batch_bytes
+        self.reset()
+
+    def reset(self):
+        self._requests = []     # 待送出的請求：(custom_id, prompt, image_path)，送出時才讀取圖片
+        self._keys = {}         # custom_id -> key（通常是圖片路徑）
+        self._cache_keys = {}   # custom_id -> 快取 key
+        self._results = {}      # key -> 回應文字（含快取命中的結果）
+
+    def add_request(self, key, prompt="", image_path=None):
+        """
+        加入一個請求；key 用來對應回傳結果，例如圖片路徑。
+        已在快取中的請求不會送出。
+        """
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(self.model_name, prompt, image_path, self.max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._results[key] = cached
+                return
+
+        # custom_id 只能包含英數字、底線與 dash
+        custom_id = f"request-{len(self._requests)}"
+        self._keys[custom_id] = key
+        self._cache_keys[custom_id] = cache_key
+        self._requests.append((custom_id, prompt, image_path))
+
+    def build_request(self, custom_id, prompt="", image_path=None):
+        """
+        組出單一 batch 請求，圖片在這時才以 base64 編碼。
+        """
+        return {
+            "custom_id": custom_id,
+            "params": {
+                "model": self.model_name,
+                "max_tokens": self.max_tokens,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": self.build_content(prompt, image_path),
+                    }
+                ],
+            },
+        }
+
+    def submit(self):
+        """
+        依數量與大小上限把請求拆成多個 batch 逐一送出，回傳 batch id list；沒有待送出的請求時回傳空 list。
+        同一時間只保留一個 batch 的圖片內容在記憶體中。
+        """
+        batch_ids = []
+        chunk, size = [], 0
+        for custom_id, prompt, image_path in self._requests:
+            request = self.build_request(custom_id, prompt, image_path)
+            request_size = len(json.dumps(request))
+            if chunk and (len(chunk) >= self.max_batch_requests or size + request_size > self.max_batch_bytes):
+                batch_ids.append(self._create_batch(chunk))
+                chunk, size = [], 0
+            chunk.append(request)
+            size += request_size
+        if chunk:
+            batch_ids.append(self._create_batch(chunk))
+        return batch_ids
+
+    def _create_batch(self, requests):
+        batch = self.get_client().messages.batches.create(requests=requests)
+        print(f"Submitted batch {batch.id} with {len(requests)} requests.")
+        return batch.id
+
+    def wait(self, batch_ids):
+        """
+        每 poll_interval 秒查詢一次所有 batch，直到全部處理完成。
+        """
+        client = self.get_client()
+        pending = list(batch_ids)
+        while True:
+            for batch_id in list(pending):
+                batch = client.messages.batches.retrieve(batch_id)
+                if batch.processing_status == "ended":
+                    pending.remove(batch_id)
+                    continue
+                counts = batch.request_counts
+                print(f"Batch {batch_id} is {batch.processing_status}: "
+                      f"{counts.processing} processing, {counts.succeeded} succeeded, {counts.errored} errored.")
+            if not pending:
+                return
+            time.sleep(self.poll_interval)
+
+    def collect(self, batch_ids):
+        """
+        取回所有 batch 的結果並對應回 key；失敗或過期的請求不會出現在結果中。
+        """
+        for batch_id in batch_ids:
+            self._collect_batch(batch_id)
+        return self._results
+
+    def _collect_batch(self, batch_id):
+        for entry in self.get_client().messages.batches.results(batch_id):
+            key = self._keys.get(entry.custom_id)
+            if key is None:
+                continue
+            if entry.result.type != "succeeded":
+                print(f"Batch request for {key} {entry.result.type}.")
+                continue
+            text = "".join(block.text for block in entry.result.message.content if hasattr(block, "text"))
+            cache_key = self._cache_keys.get(entry.custom_id)
+            if cache_key:
+                self.cache.set(cache_key, text)
+            self._results[key] = text
+
+    def run(self):
+        """
+        送出所有請求並等待完成，回傳 {key: 回應文字}，之後清空請求以便下一批使用。
+        """
+        batch_ids = self.submit()
+        if batch_ids:
+            self.wait(batch_ids)
+            self.collect(batch_ids)
+        results = self._results
+        self.reset()
+        return results
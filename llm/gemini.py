@@ -1,42 +1,77 @@
 import PIL.Image
-import time
 import os
 import google.generativeai as genai
 from dotenv import load_dotenv
 from llm.llm import LLM
+from llm.ratelimit import estimate_tokens
 
 class GEMINI(LLM):
-    def __init__(self, api_key):
-        super().__init__(api_key)
+    requests_per_minute = 2
+    tokens_per_minute = 32000
+
+    def __init__(self, api_key, cache=None, base_url=None):
+        super().__init__(api_key, cache, base_url)
         genai.configure(api_key=self.api_key)
-        self.last_execution_time = None  # 記錄上次執行時間
 
-    def generate(self, prompt="", image_path=None, model_name="gemini-1.5-pro-002", needwaiting = True):
-        current_time = time.time()
+    def _create_client(self, model_name=None):
+        return genai.GenerativeModel(model_name=model_name)
+
+    def generate(self, prompt="", image_path=None, model_name="gemini-1.5-pro-002", needwaiting = True, use_cache=True):
+        use_cache = use_cache and bool(self.cache)
+        if use_cache:
+            cache_key = self.cache.make_key(model_name, prompt, image_path)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        # 如果有上次執行時間，且未滿 30 秒，則等待
-        if self.last_execution_time and (current_time - self.last_execution_time < 30) and needwaiting:
-            wait_time = 30 - (current_time - self.last_execution_time)
-            print(f"Waiting for {wait_time:.2f} seconds to comply with the 30-second rule.")
-            time.sleep(wait_time)
+        # 所有 GEMINI 實例共用 RPM/TPM 配額
+        if needwaiting:
+            wait_time = self.rate_limiter.acquire(estimate_tokens(prompt, image_path))
+            if wait_time:
+                print(f"Waited {wait_time:.2f} seconds to comply with the rate limit.")
 
         message = [prompt]
-        if image_path:
-            image = PIL.Image.open(image_path)
-            message.append(image)
-        else:
-            image = None
+        for path in self.image_paths(image_path):
+            message.append(PIL.Image.open(path))
 
-        model = genai.GenerativeModel(model_name=model_name)
+        model = self.get_client(model_name)
         try:
             response = model.generate_content(message)
             print(f"response: {response.text}")
-            # 更新上次執行時間
-            self.last_execution_time = time.time()
+            if use_cache:
+                self.cache.set(cache_key, response.text)
             return response.text
         except Exception as e:
             print(f"Error: {e}")
 
+    def generate_stream(self, prompt="", image_path=None, model_name="gemini-1.5-pro-002", needwaiting = True, use_cache=True):
+        """
+        以串流方式產生回應，逐段 yield 文字。
+        """
+        use_cache = use_cache and bool(self.cache)
+        if use_cache:
+            cache_key = self.cache.make_key(model_name, prompt, image_path)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        if needwaiting:
+            self.rate_limiter.acquire(estimate_tokens(prompt, image_path))
+
+        message = [prompt]
+        for path in self.image_paths(image_path):
+            message.append(PIL.Image.open(path))
+
+        model = self.get_client(model_name)
+        extracted_text = ""
+        for chunk in model.generate_content(message, stream=True):
+            extracted_text += chunk.text
+            yield chunk.text
+
+        if use_cache:
+            self.cache.set(cache_key, extracted_text)
+
     
 if __name__ == "__main__":
     load_dotenv()
@@ -1,6 +1,58 @@
+import threading
+from llm.cache import LLMCache
+from llm.ratelimit import RateLimiter
+
 class LLM:
-    def __init__(self, api_key):
+    # 每分鐘配額，子類別依供應商設定；同一類別的所有實例共用一個 rate limiter
+    requests_per_minute = 50
+    tokens_per_minute = None
+
+    # 整個 process 共用的 client，key 為 (類別, api_key, base_url, model_name)；Streamlit rerun 時不會重建
+    _clients = {}
+    _clients_lock = threading.Lock()
+
+    def __init__(self, api_key, cache=None, base_url=None):
         self.api_key = api_key
+        # 自訂 API 端點，例如測試用的本機假伺服器
+        self.base_url = base_url
+        # 回應快取；傳入 False 可完全停用
+        self.cache = LLMCache() if cache is None else cache
+
+    @property
+    def rate_limiter(self):
+        return RateLimiter.shared(type(self).__name__, self.requests_per_minute, self.tokens_per_minute)
+
+    @staticmethod
+    def image_paths(image_path):
+        """
+        image_path 可為單一路徑或路徑 list（一次請求附上多張圖片），統一轉成 list。
+        """
+        if not image_path:
+            return []
+        if isinstance(image_path, (list, tuple)):
+            return list(image_path)
+        return [image_path]
+
+    def generate(self, prompt="", image_path=None, **kwargs):
+        raise NotImplementedError
 
+    def generate_stream(self, prompt="", image_path=None, **kwargs):
+        """
+        以串流方式產生回應；不支援串流的子類別一次 yield 完整結果。
+        """
+        res = self.generate(prompt=prompt, image_path=image_path, **kwargs)
+        if res:
+            yield res
 
+    def get_client(self, model_name=None):
+        """
+        取得長期共用的 client，保留 HTTP 連線池以免每次請求重新建立連線。
+        """
+        key = (type(self).__name__, self.api_key, self.base_url, model_name)
+        with LLM._clients_lock:
+            if key not in LLM._clients:
+                LLM._clients[key] = self._create_client(model_name)
+            return LLM._clients[key]
 
+    def _create_client(self, model_name=None):
+        raise NotImplementedError
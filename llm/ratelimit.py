@@ -0,0 +1,117 @@
+import time
+import threading
+
+
+class TokenBucket:
+    """
+    Token bucket：容量為每分鐘配額，依時間連續補充。
+    """
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0  # 每秒補充量
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount):
+        """
+        取得 amount 個 token 還需等待的秒數（呼叫前需先 refill）。
+        """
+        amount = min(amount, self.capacity)  # 超過容量的請求最多等到桶滿
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    同時限制每分鐘請求數 (RPM) 與每分鐘 token 數 (TPM) 的 rate limiter，可在多執行緒間共用。
+    """
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute, tokens_per_minute=None):
+        self._lock = threading.Lock()
+        self._request_bucket = TokenBucket(requests_per_minute)
+        self._token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.calls = 0
+        self.waited_calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @classmethod
+    def shared(cls, name, requests_per_minute, tokens_per_minute=None):
+        """
+        取得整個 process 共用的 rate limiter；同一個 name 只會建立一次。
+        """
+        with cls._shared_lock:
+            if name not in cls._shared:
+                cls._shared[name] = cls(requests_per_minute, tokens_per_minute)
+            return cls._shared[name]
+
+    def acquire(self, tokens=0):
+        """
+        等待直到 RPM 與 TPM 配額都足夠，扣除後回傳實際等待的秒數。
+        """
+        start = time.monotonic()
+        slept = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                buckets = [(self._request_bucket, 1)]
+                if self._token_bucket and tokens:
+                    buckets.append((self._token_bucket, tokens))
+                for bucket, _ in buckets:
+                    bucket.refill(now)
+                wait = max(bucket.wait_time(amount) for bucket, amount in buckets)
+                if wait <= 0:
+                    for bucket, amount in buckets:
+                        bucket.consume(amount)
+                    waited = now - start if slept else 0.0
+                    self._record(waited)
+                    return waited
+            time.sleep(wait)
+            slept = True
+
+    def _record(self, waited):
+        self.calls += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 0:
+            self.waited_calls += 1
+
+    def metrics(self):
+        """
+        回傳等待時間統計。
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "waited_calls": self.waited_calls,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+                "average_wait": self.total_wait / self.calls if self.calls else 0.0,
+            }
+
+
+def estimate_tokens(prompt="", image_path=None):
+    """
+    粗估一次請求的輸入 token 數：文字以字元數計，圖片以 (寬 x 高) / 750 計。
+    image_path 可為單一路徑或路徑 list。
+    """
+    tokens = len(prompt or "")
+    if not image_path:
+        return tokens
+    import PIL.Image
+    image_paths = image_path if isinstance(image_path, (list, tuple)) else [image_path]
+    for path in image_paths:
+        with PIL.Image.open(path) as image:
+            width, height = image.size
+        tokens += int(width * height / 750)
+    return tokens
@@ -23,6 +23,10 @@ from . import constants
 class Element(IText):
     '''Boundary box with attribute in fitz.Rect type.'''
 
+    # NOTE: attributes are declared in slots for the large number of instances, e.g. chars;
+    # subclasses not declaring ``__slots__`` get ``__dict__`` as usual.
+    __slots__ = ('bbox', '_parent')
+
     # all coordinates are related to un-rotated page in PyMuPDF
     # e.g. Matrix(0.0, 1.0, -1.0, 0.0, 842.0, 0.0)
     ROTATION_MATRIX = fitz.Matrix(0.0) # rotation angle = 0 degree by default
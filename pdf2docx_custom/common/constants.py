@@ -87,4 +87,14 @@ CJK_UNICODE_RANGES = [
     [0xA490, 0xA4CF],  # Yi Radicals
 ]
 
-DEFAULT_FONT_NAME = 'helv'
\ No newline at end of file
+DEFAULT_FONT_NAME = 'helv'
+
+# text extracted in level of chars, spans or lines, see setting ``text_extraction_level``
+TEXT_EXTRACTION_LEVELS = ('chars', 'spans', 'lines')
+
+# -------------------------------------
+# parse cache
+# -------------------------------------
+# NOTE: increase it once the parsed layout changes, so that pages cached by old parser are
+# parsed again
+PARSER_VERSION = '0.5.8.2'
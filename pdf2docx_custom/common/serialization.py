@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+'''Compact binary format of parsed layout, i.e. the dict given by ``store()``.
+
+Image bytes are base64 encoded in the dict so as to be stored in JSON; in binary format,
+they're decoded and held out of line, while the rest of the layout is compressed compact JSON::
+
+    header  : magic (4s), format version (B), count of images (I)
+    images  : [length (Q), image bytes] * count
+    layout  : zlib compressed JSON, where each image is replaced with its index in images
+'''
+
+import json
+import zlib
+import base64
+import struct
+
+MAGIC = b'P2DX'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sBI')
+_LENGTH = struct.Struct('<Q')
+
+
+def dumps(data:dict, level:int=6):
+    '''Serialize parsed layout to bytes.
+
+    Args:
+        data (dict): Parsed layout, e.g. ``Converter.store()``, ``Page.store()``.
+        level (int, optional): zlib compression level. Defaults to 6.
+
+    Returns:
+        bytes: Serialized layout.
+    '''
+    images = []
+    layout = _hold_out_images(data, images)
+
+    chunks = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(images))]
+    for image in images:
+        chunks.append(_LENGTH.pack(len(image)))
+        chunks.append(image)
+    text = json.dumps(layout, separators=(',', ':'))
+    chunks.append(zlib.compress(text.encode('utf-8'), level))
+    return b''.join(chunks)
+
+
+def loads(data:bytes):
+    '''Deserialize parsed layout from bytes given by :py:meth:`dumps`.
+
+    Image bytes are restored as ``bytes`` rather than base64 encoded string, which is
+    accepted by ``Image`` directly.
+    '''
+    view = memoryview(data)
+    magic, version, count = _HEADER.unpack_from(view, 0)
+    if magic!=MAGIC:
+        raise ValueError('Invalid binary layout data.')
+    if version!=FORMAT_VERSION:
+        raise ValueError(f'Unsupported binary layout version: {version}.')
+
+    pos = _HEADER.size
+    images = []
+    for _ in range(count):
+        length, = _LENGTH.unpack_from(view, pos)
+        pos += _LENGTH.size
+        images.append(bytes(view[pos:pos+length]))
+        pos += length
+
+    layout = json.loads(zlib.decompress(view[pos:]).decode('utf-8'))
+    return _restore_images(layout, images)
+
+
+def _hold_out_images(data, images:list):
+    '''Copy of ``data`` with base64 encoded images replaced by their index in ``images``.'''
+    if isinstance(data, dict):
+        res = {}
+        for k, v in data.items():
+            if k=='image' and isinstance(v, (str, bytes)):
+                images.append(v if isinstance(v, bytes) else base64.b64decode(v.encode()))
+                res[k] = len(images)-1
+            else:
+                res[k] = _hold_out_images(v, images)
+        return res
+
+    if isinstance(data, (list, tuple)):
+        return [_hold_out_images(v, images) for v in data]
+
+    return data
+
+
+def _restore_images(data, images:list):
+    '''Replace image index with image bytes in place.'''
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if k=='image' and isinstance(v, int):
+                data[k] = images[v]
+            else:
+                _restore_images(v, images)
+
+    elif isinstance(data, list):
+        for v in data:
+            _restore_images(v, images)
+
+    return data
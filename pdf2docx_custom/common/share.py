@@ -58,6 +58,8 @@ class TextAlignment(Enum):
 
 class IText:
     '''Text related interface considering text direction.'''
+    __slots__ = ()
+
     @property
     def text_direction(self):
         '''Text direction is from left to right by default.'''
@@ -125,6 +127,8 @@ def lower_round(number:float, ndigits:int=0):
 
 def decode(s:str):
     '''Try to decode a unicode string.'''
+    # decoded already if any character out of byte range
+    if any(ord(c)>255 for c in s): return s
     b = bytes(ord(c) for c in s)
     for encoding in ['utf-8', 'gbk', 'gb2312', 'iso-8859-1']:
         try:
@@ -11,6 +11,10 @@ from docx import Document
 
 from .page.Page import Page
 from .page.Pages import Pages
+from .page.PagesCache import PagesCache
+from .font.Fonts import Fonts
+from .common import serialization
+from .common.constants import TEXT_EXTRACTION_LEVELS
 
 # check PyMuPDF version
 # 1.19.0 <= v <= 1.23.8, or v>=1.23.16
@@ -18,6 +22,9 @@ v = list(map(int, fitz.VersionBind.split(".")))
 if v < [1,19,0] or [1,23,8]<v<[1,23,16]:
     raise SystemExit("1.19.0 <= PyMuPDF <= 1.23.8, or PyMuPDF>=1.23.16 is required for pdf2docx.")
 
+# converter and configuration parameters of current worker process in multi-processing mode
+_worker = None
+
 # logging
 logging.basicConfig(
     level=logging.INFO, 
@@ -52,6 +59,7 @@ class Converter:
         if not pdf_file and not stream:
             raise ValueError("Either pdf_file or stream must be given.")
 
+        self._stream = stream
         if stream:
             self._fitz_doc = fitz.Document(stream=stream)
 
@@ -61,6 +69,9 @@ class Converter:
         # initialize empty pages container
         self._pages = Pages()
 
+        # fonts extracted from whole document, reused by later parsing
+        self._fonts = None
+
 
     @property
     def fitz_doc(self): return self._fitz_doc    
@@ -79,8 +90,8 @@ class Converter:
             'debug'                          : False,  # plot layout if True
             'ocr'                            : 0,      # ocr status: 0 - no ocr; 1 - to do ocr; 2 - ocr-ed pdf
             'ignore_page_error'              : True,   # not break the conversion process due to failure of a certain page if True
-            'multi_processing'               : False,  # convert pages with multi-processing if True
-            'cpu_count'                      : 0,      # working cpu count when convert pages with multi-processing
+            'multi_processing'               : False,  # parse pages with multi-processing if True
+            'cpu_count'                      : 0,      # working cpu count when parse pages with multi-processing
             'min_section_height'             : 20.0,   # The minimum height of a valid section.
             'connected_border_tolerance'     : 0.5,    # two borders are intersected if the gap lower than this value
             'max_border_width'               : 6.0,    # max border width
@@ -106,7 +117,10 @@ class Converter:
             'extract_stream_table'           : False,  # don't consider stream table when extracting tables
             'parse_lattice_table'            : True,   # whether parse lattice table or not; may destroy the layout if set False
             'parse_stream_table'             : True,   # whether parse stream table or not; may destroy the layout if set False
-            'delete_end_line_hyphen'         : False   # delete hyphen at the end of a line
+            'delete_end_line_hyphen'         : False,  # delete hyphen at the end of a line
+            'locate_tables_only'             : False,  # stop after table detection, i.e. table position only
+            'text_extraction_level'          : 'chars',# extract text in level of 'chars', 'spans' or 'lines'; char bbox is estimated if not 'chars'
+            'parse_cache_dir'                : None    # reuse parsed pages cached in this directory if given
         }
 
     # -----------------------------------------------------------------------
@@ -124,10 +138,38 @@ class Converter:
             end (int, optional): Last page to process. Defaults to None, the last page.
             pages (list, optional): Range of page indexes to parse. Defaults to None.
             kwargs (dict, optional): Configuration parameters. 
+
+        .. note::
+            Pages are parsed with multi-processing if ``multi_processing=True``, in which case
+            step 2 and step 3 are done in the worker processes.
+
+        .. note::
+            Pages cached in ``parse_cache_dir`` are restored directly if given, and only the
+            missing pages are parsed and then cached.
         '''
-        return self.load_pages(start, end, pages) \
-            .parse_document(**kwargs) \
-            .parse_pages(**kwargs)
+        # check settings in advance, otherwise it's ignored as page error
+        level = kwargs.get('text_extraction_level', 'chars')
+        if level not in TEXT_EXTRACTION_LEVELS:
+            raise ValueError(f"Invalid text extraction level: {level}.")
+
+        self.load_pages(start, end, pages)
+
+        # restore cached pages
+        cache = self._parse_cache(**kwargs)
+        if cache: self._restore_cached_pages(cache)
+        page_indexes = [page.id for page in self._pages if not page.skip_parsing]
+        if not page_indexes: return self
+
+        # parse the others
+        if kwargs.get('multi_processing', False):
+            self._parse_with_multi_processing(**kwargs)
+        else:
+            self.parse_document(**kwargs).parse_pages(**kwargs)
+
+        # cache newly parsed pages
+        if cache: self._cache_parsed_pages(cache, page_indexes)
+
+        return self
 
 
     def load_pages(self, start:int=0, end:int=None, pages:list=None):
@@ -165,8 +207,13 @@ class Converter:
         '''Step 2 of converting process: analyze whole document, e.g. page section,
         header/footer and margin.'''
         logging.info(self._color_output('[2/4] Analyzing document...'))
+
+        # NOTE: font properties make sense to paragraph parsing only, so skip them when
+        # locating tables
+        if self._fonts is None and not kwargs.get('locate_tables_only', False):
+            self._fonts = Fonts.extract(self._fitz_doc)
         
-        self._pages.parse(self.fitz_doc, **kwargs)
+        self._pages.parse(self.fitz_doc, fonts=self._fonts, **kwargs)
         return self
 
     
@@ -240,7 +287,7 @@ class Converter:
     def store(self):
         '''Store parsed pages in dict format.'''
         return {
-            'filename': os.path.basename(self.filename_pdf),
+            'filename': os.path.basename(self.filename_pdf) if self.filename_pdf else '',
             'page_cnt': len(self._pages), # count of all pages
             'pages'   : [page.store() for page in self._pages if page.finalized], # parsed pages only
         }
@@ -259,6 +306,42 @@ class Converter:
             self._pages[idx].restore(raw_page)
 
 
+    def _parse_cache(self, **kwargs):
+        '''Cache of parsed pages for current pdf and parsing parameters, or None if disabled.
+        Cache is always disabled in debug mode, where the layout has to be plotted.'''
+        cache_dir = kwargs.get('parse_cache_dir', None)
+        if not cache_dir or kwargs.get('debug', False): return None
+
+        pdf_hash = PagesCache.hash_pdf(self.filename_pdf, self._stream)
+        settings_hash = PagesCache.hash_settings(kwargs, self.default_settings)
+        return PagesCache(cache_dir, pdf_hash, settings_hash)
+
+
+    def _restore_cached_pages(self, cache:PagesCache):
+        '''Restore cached pages and skip parsing them. A page failed to restore is parsed again,
+        i.e. taken as a cache miss.'''
+        for page in self._pages:
+            if page.skip_parsing: continue
+            raw_page = cache.get(page.id)
+            if raw_page is None: continue
+            try:
+                page.restore(raw_page)
+            except Exception as e:
+                logging.warning('Ignore cached page %d due to restoring error: %s', page.id+1, e)
+                page.sections.reset()
+                page.float_images.reset()
+                continue
+            page.skip_parsing = True
+            logging.info('Restore page %d from cache.', page.id+1)
+
+
+    def _cache_parsed_pages(self, cache:PagesCache, page_indexes:list):
+        '''Store specified pages to cache if parsed successfully.'''
+        for i in page_indexes:
+            page = self._pages[i]
+            if page.finalized: cache.set(i, page.store())
+
+
     def serialize(self, filename:str):
         '''Write parsed pages to specified JSON file.'''
         with open(filename, 'w', encoding='utf-8') as f:
@@ -272,6 +355,21 @@ class Converter:
         self.restore(data)
 
 
+    def serialize_binary(self, filename:str):
+        '''Write parsed pages to specified file in compact binary format, which is much 
+        smaller and faster than JSON especially for pages with images. Refer to 
+        :py:mod:`~pdf2docx.common.serialization` for the format.'''
+        with open(filename, 'wb') as f:
+            f.write(serialization.dumps(self.store()))
+
+
+    def deserialize_binary(self, filename:str):
+        '''Load parsed pages from specified file written by :py:meth:`serialize_binary`.'''
+        with open(filename, 'rb') as f:
+            data = serialization.loads(f.read())
+        self.restore(data)
+
+
     # -----------------------------------------------------------------------
     # high level methods, e.g. convert, extract table
     # -----------------------------------------------------------------------
@@ -328,25 +426,14 @@ class Converter:
         .. note::
             ``pages`` has a higher priority than ``start`` and ``end``. ``start`` and ``end`` works only
             if ``pages`` is omitted.
-
-        .. note::
-            Multi-processing works only for continuous pages specified by ``start`` and ``end`` only.
         """
         t0 = perf_counter()
         logging.info('Start to convert %s', self.filename_pdf)
         settings = self.default_settings
         settings.update(kwargs)
 
-        # input check
-        if pages and settings['multi_processing']:
-            raise ConversionException('Multi-processing works for continuous pages '
-                                    'specified by "start" and "end" only.')
-        
         # convert page by page
-        if settings['multi_processing']:
-            self._convert_with_multi_processing(docx_filename, start, end, **settings)
-        else:
-            self.parse(start, end, pages, **settings).make_docx(docx_filename, **settings)
+        self.parse(start, end, pages, **settings).make_docx(docx_filename, **settings)
 
         logging.info('Terminated in %.2fs.', perf_counter()-t0)        
 
@@ -362,6 +449,12 @@ class Converter:
         
         Returns:
             list: A list of parsed table content.
+
+        .. note::
+            Set ``locate_tables_only=True`` if only the table position is required. Font
+            extraction, image recovery, paragraph parsing and cell layout parsing are skipped
+            in this mode, so the parsed pages can't be used to create docx. Set also 
+            ``text_extraction_level='spans'`` to skip char level text extraction.
         '''
         # parsing pages first
         settings = self.default_settings
@@ -375,80 +468,97 @@ class Converter:
 
         return tables
 
+
+    def render_tables(self, start:int=0, end:int=None, pages:list=None, zoom:float=1.0, **kwargs):
+        '''Locate tables in specified PDF pages and render table regions to images, with the
+        document already loaded.
+
+        Args:
+            start (int, optional): First page to process. Defaults to 0, the first page.
+            end (int, optional): Last page to process. Defaults to None, the last page.
+            pages (list, optional): Range of page indexes. Defaults to None.
+            zoom (float, optional): Zoom factor of rendered images. Defaults to 1.0.
+            kwargs (dict, optional): Configuration parameters. Defaults to ``locate_tables_only=True``
+                and ``text_extraction_level='spans'``, i.e. no char level details.
+
+        Yields:
+            tuple: Table in dict format, same as :py:meth:`extract_tables`, and ``fitz.Pixmap``
+            of the table region.
+
+        .. note::
+            Table regions are rendered with text visible, since page text hidden to clip page 
+            images is always restored after parsing the page.
+        '''
+        settings = {'locate_tables_only': True, 'text_extraction_level': 'spans'}
+        settings.update(kwargs)
+        tables = self.extract_tables(start, end, pages, **settings)
+
+        matrix = fitz.Matrix(zoom, zoom)
+        for table in tables:
+            page = self._fitz_doc[table['id']]
+            yield table, page.get_pixmap(clip=table['position'], matrix=matrix)
+
     
-    def _convert_with_multi_processing(self, docx_filename:str, start:int, end:int, **kwargs):
-        '''Parse and create pages based on page indexes with multi-processing.
+    def _parse_with_multi_processing(self, **kwargs):
+        '''Parse loaded pages with multi-processing. Parsed pages are sent back to current 
+        process in dict format, i.e. ``Page.store()``, and then restored.
+
+        Pages are scheduled one by one, so an idle process takes the next page as soon as 
+        it finishes current one; each process opens the pdf and extracts fonts only once.
 
         Reference:
 
             https://pymupdf.readthedocs.io/en/latest/faq.html#multiprocessing
         '''
-        # make vectors of arguments for the processes
-        cpu = min(kwargs['cpu_count'], cpu_count()) if kwargs['cpu_count'] else cpu_count()        
-        prefix = 'pages' # json file writing parsed pages per process
-        vectors = [(i, cpu, start, end, self.filename_pdf, self.password, 
-                            kwargs, f'{prefix}-{i}.json') for i in range(cpu)]
-
-        # start parsing processes
-        pool = Pool()
-        pool.map(self._parse_pages_per_cpu, vectors, 1)
-        
-        # restore parsed page data
-        for i in range(cpu):
-            filename = f'{prefix}-{i}.json'
-            if not os.path.exists(filename): continue            
-            self.deserialize(filename)
-            os.remove(filename)
-        
-        # create docx file
-        self.make_docx(docx_filename, **kwargs)
+        page_indexes = [page.id for page in self._pages if not page.skip_parsing]
+        if not page_indexes: return self
+
+        # no necessary to start processes for one cpu or one page
+        cpu = min(kwargs['cpu_count'], cpu_count()) if kwargs['cpu_count'] else cpu_count()
+        cpu = min(cpu, len(page_indexes))
+        if cpu<=1:
+            return self.parse_document(**kwargs).parse_pages(**kwargs)
+
+        # arguments to re-open the pdf in each process
+        stream = None if self.filename_pdf else self._stream
+        initargs = (self.filename_pdf, stream, self.password, kwargs)
+
+        # start parsing processes and restore parsed page data
+        logging.info(self._color_output('[2-3/4] Analyzing document and parsing pages with %d processes...'), cpu)
+        with Pool(cpu, initializer=Converter._init_worker, initargs=initargs) as pool:
+            for raw_page in pool.imap_unordered(Converter._parse_page_per_worker, page_indexes):
+                if raw_page: self.restore({'pages': [raw_page]})
+
+        return self
 
 
     @staticmethod
-    def _parse_pages_per_cpu(vector):
-        '''Render a page range of a document.
-        
+    def _init_worker(pdf_filename:str, stream:bytes, password:str, kwargs:dict):
+        '''Open pdf once per worker process, which is kept for all pages parsed by this process.
+
         Args:
-            vector (list): A list containing required parameters.
-                * 0  : segment number for current process                
-                * 1  : count of CPUs
-                * 2,3: whole pages range to process
-                * 4  : pdf filename
-                * 5  : password for encrypted pdf
-                * 6  : configuration parameters
-                * 7  : json filename storing parsed results
-        '''        
-        # recreate the arguments
-        idx, cpu, s, e, pdf_filename, password, kwargs, json_filename = vector
-
-        # open pdf to get page count: all pages are marked to parse temporarily 
-        # since don't know which pages to parse for this moment
-        cv = Converter(pdf_filename, password)
-        cv.load_pages()
-
-        # the specified pages to process
-        e = e or len(cv.fitz_doc)
-        all_indexes = range(s, e)
-        num_pages = len(all_indexes)
-
-        # page segment processed by this cpu
-        m = int(num_pages/cpu)
-        n = num_pages % cpu
-        seg_size = m + int(idx<n)
-        seg_from = (m+1)*idx + min(n-idx, 0)
-        seg_to = min(seg_from + seg_size, num_pages)
-        page_indexes = [all_indexes[i] for i in range(seg_from, seg_to)]
-
-        # now, mark the right pages
-        for page in cv.pages: page.skip_parsing = True
-        for i in page_indexes: 
-            cv.pages[i].skip_parsing = False
-
-        # parse pages and serialize data for further processing
-        cv.parse_document(**kwargs) \
-            .parse_pages(**kwargs) \
-            .serialize(json_filename)
-        cv.close()
+            pdf_filename (str): pdf filename.
+            stream (bytes): pdf stream, used if no pdf filename.
+            password (str): password for encrypted pdf.
+            kwargs (dict): configuration parameters.
+        '''
+        global _worker
+        _worker = (Converter(pdf_filename, password, stream), kwargs)
+
+
+    @staticmethod
+    def _parse_page_per_worker(page_index:int):
+        '''Parse a page with the converter of current worker process.
+
+        Returns:
+            dict: Parsed page in dict format, or None if failed.
+        '''
+        cv, kwargs = _worker
+        cv.load_pages(pages=[page_index]) \
+            .parse_document(**kwargs) \
+            .parse_pages(**kwargs)
+        page = cv.pages[page_index]
+        return page.store() if page.finalized else None
 
 
     @staticmethod
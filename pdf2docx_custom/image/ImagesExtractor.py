@@ -23,6 +23,9 @@ class ImagesExtractor:
             page (fitz.Page): pdf page to extract images.
         '''
         self._page = page
+
+        # original streams of page contents when page text is hidden: {xref: stream}
+        self._hidden_streams = None
     
 
     def clip_page_to_pixmap(self, bbox:fitz.Rect=None, zoom:float=3.0):
@@ -37,8 +40,8 @@ class ImagesExtractor:
         Returns:
             fitz.Pixmap: The extracted pixmap.
         '''        
-        # hide text 
-        self._hide_page_text(self._page)
+        # hide text: once until restored with ``restore_page_text()``
+        self._hide_page_text()
         
         if bbox is None:
             clip_bbox = self._page.rect
@@ -116,7 +119,7 @@ class ImagesExtractor:
 
         # step 2: group by intersection
         fun = lambda a, b: a[0].intersects(b[0])
-        groups = ic.group(fun)
+        groups = ic.group(fun, lambda a: (a[0].x0, a[0].x1))
 
         # step 3: check each group
         images = []
@@ -286,12 +289,27 @@ class ImagesExtractor:
         return im_png.tobytes()
 
 
-    @staticmethod
-    def _hide_page_text(page:fitz.Page):
-        '''Hide page text before clipping page.'''
+    def restore_page_text(self):
+        '''Restore page contents modified by hiding page text before clipping page.'''
+        if not self._hidden_streams:
+            self._hidden_streams = None
+            return
+
+        doc = self._page.parent # type: fitz.Document
+        for xref, stream in self._hidden_streams.items():
+            doc.update_stream(xref, stream)
+        self._hidden_streams = None
+
+
+    def _hide_page_text(self):
+        '''Hide page text before clipping page. Page contents are patched only once, and the 
+        original streams are kept so as to restore page text with ``restore_page_text()``.'''
+        if self._hidden_streams is not None: return
+
         # NOTE: text might exist in both content stream and form object stream
         # - content stream, i.e. direct page content
         # - form object, i.e. contents referenced by this page
+        page = self._page
         xref_list = [xref for (xref, name, invoker, bbox) in page.get_xobjects()]
         xref_list.extend(page.get_contents())        
 
@@ -301,12 +319,17 @@ class ImagesExtractor:
         # - https://github.com/pymupdf/PyMuPDF/issues/257
         # - https://www.adobe.com/content/dam/acom/en/devnet/pdf/pdfs/pdf_reference_archives/PDFReference.pdf
         doc = page.parent # type: fitz.Document
+        self._hidden_streams = {}
         for xref in xref_list:
-            stream = doc.xref_stream(xref).replace(b'BT', b'BT 3 Tr') \
-                                             .replace(b'Tm', b'Tm 3 Tr') \
-                                             .replace(b'Td', b'Td 3 Tr')
+            if xref in self._hidden_streams: continue # form object referenced more than once
+            source = doc.xref_stream(xref)
+            self._hidden_streams[xref] = source
+            stream = source.replace(b'BT', b'BT 3 Tr') \
+                           .replace(b'Tm', b'Tm 3 Tr') \
+                           .replace(b'Td', b'Td 3 Tr')
             doc.update_stream(xref, stream)
    
+
     @staticmethod
     def _recover_pixmap(doc:fitz.Document, item:list):
         """Restore pixmap with soft mask considered.
@@ -357,12 +380,30 @@ class ImagesExtractor:
 
     @staticmethod
     def _pixmap_to_cv_image(pixmap:fitz.Pixmap):
-        '''Convert fitz Pixmap to opencv image.
+        '''Convert fitz Pixmap to opencv image, i.e. BGR array. The pixmap samples are viewed
+        as array directly, rather than encoded to png and then decoded.
 
         Args:
             pixmap (fitz.Pixmap): PyMuPDF Pixmap.
         '''
         import cv2 as cv
         import numpy as np
-        img_byte = pixmap.tobytes()
-        return cv.imdecode(np.frombuffer(img_byte, np.uint8), cv.IMREAD_COLOR)
\ No newline at end of file
+
+        # convert colorspace other than gray and RGB, e.g. CMYK, to RGB
+        if pixmap.colorspace and pixmap.colorspace.n not in (1, 3):
+            pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+
+        # view samples as (height, width, components) array, where rows might be padded
+        h, w, n = pixmap.height, pixmap.width, pixmap.n
+        img = np.ndarray((h, w, n), dtype=np.uint8, buffer=pixmap.samples_mv, strides=(pixmap.stride, n, 1))
+
+        # color components are premultiplied with alpha: divide it out and drop alpha, 
+        # the same as decoding png in color mode
+        # (opencv gives 0 when dividing by 0, i.e. fully transparent pixels)
+        if pixmap.alpha:
+            color = np.ascontiguousarray(img[..., :-1])
+            alpha = np.repeat(img[..., -1:], n-1, axis=2)
+            img = cv.divide(color, alpha, scale=255)
+
+        code = cv.COLOR_GRAY2BGR if n-pixmap.alpha==1 else cv.COLOR_RGB2BGR
+        return cv.cvtColor(img, code)
\ No newline at end of file
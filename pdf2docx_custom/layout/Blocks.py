@@ -387,7 +387,7 @@ class Blocks(ElementCollection):
         '''
         # group lines by overlap
         fun = lambda a, b: a.get_main_bbox(b, threshold=line_overlap_threshold)
-        groups = self.group(fun)
+        groups = self.group(fun, lambda a: (a.bbox.x0, a.bbox.x1))
         
         # delete overlapped lines
         for group in filter(lambda group: len(group)>1, groups):
@@ -112,6 +112,9 @@ class Layout(Element, ABC):
         # parse tables
         self._parse_table(**settings)
 
+        # table position is ready: skip paragraph and sub-layout
+        if settings['locate_tables_only']: return
+
         # parse paragraphs
         self._parse_paragraph(**settings)
 
@@ -146,6 +149,9 @@ class Layout(Element, ABC):
                 settings['max_border_width'])
 
         # parse table structure based on implicit layout of text blocks
+        # NOTE: stream tables are ignored when locating lattice tables only
+        if settings['locate_tables_only'] and not settings['extract_stream_table']:
+            return
         if settings['parse_stream_table']:
             self._table_parser.stream_tables(
                 settings['min_border_clearance'],
@@ -168,7 +168,13 @@ class Page(BasePage):
         tables = [] # type: list[ list[list[str]] ]
         for table_block in collections:
             print(f"table_block: {table_block.bbox}")
-            tables.append({"id": self.id, "position": table_block.bbox})
+            tables.append({
+                "id": self.id,
+                "position": table_block.bbox,
+                "num_rows": table_block.num_rows,
+                "num_cols": table_block.num_cols,
+                "confidence": table_block.confidence
+            })
 
         return tables
 
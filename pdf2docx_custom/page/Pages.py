@@ -12,17 +12,22 @@ from ..font.Fonts import Fonts
 class Pages(BaseCollection):
     '''A collection of ``Page``.'''
 
-    def parse(self, fitz_doc, **settings):
+    def parse(self, fitz_doc, fonts:Fonts=None, **settings):
         '''Analyze document structure, e.g. page section, header, footer.
 
         Args:
             fitz_doc (fitz.Document): ``PyMuPDF`` Document instance.
+            fonts (Fonts, optional): Fonts extracted already. Defaults to None, i.e. extract from ``fitz_doc``.
             settings (dict): Parsing parameters.
         '''
         # ---------------------------------------------
         # 0. extract fonts properties, especially line height ratio
         # ---------------------------------------------
-        fonts = Fonts.extract(fitz_doc)
+        # NOTE: font properties make sense to paragraph parsing only, so skip them when
+        # locating tables
+        locate_tables_only = settings['locate_tables_only']
+        if fonts is None:
+            fonts = Fonts() if locate_tables_only else Fonts.extract(fitz_doc)
 
         # ---------------------------------------------
         # 1. extract and then clean up raw page
@@ -44,7 +49,7 @@ class Pages(BaseCollection):
             raw_page.clean_up(**settings)
 
             # process font properties
-            raw_page.process_font(fonts)            
+            if not locate_tables_only: raw_page.process_font(fonts)
 
             # after this step, we can get some basic properties
             # NOTE: floating images are detected when cleaning up blocks, so collect them here
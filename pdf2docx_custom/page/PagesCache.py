@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+'''On-disk cache of parsed pages.
+
+Parsed pages are stored in compact binary format of ``Page.store()``, one file per page::
+
+    cache_dir/<pdf hash>/<settings hash>/<page index>.bin
+
+where the settings hash covers the parameters different from default settings and the
+parser version, so a page is parsed again once any of them changes.
+'''
+
+import os
+import json
+import hashlib
+import logging
+import fitz
+from ..common import serialization
+from ..common.constants import PARSER_VERSION
+
+
+class PagesCache:
+    '''Cache of parsed pages for a certain pdf and parsing parameters.'''
+
+    # parameters making no difference to parsed layout
+    IGNORED_SETTINGS = ('debug', 'debug_doc', 'debug_filename', 'ignore_page_error',
+                        'multi_processing', 'cpu_count', 'parse_cache_dir')
+
+    def __init__(self, cache_dir:str, pdf_hash:str, settings_hash:str):
+        '''Initialize cache directory.
+
+        Args:
+            cache_dir (str): Root directory of the cache.
+            pdf_hash (str): Hash of pdf content, see :py:meth:`hash_pdf`.
+            settings_hash (str): Hash of parsing parameters, see :py:meth:`hash_settings`.
+        '''
+        self.path = os.path.join(cache_dir, pdf_hash, settings_hash)
+
+
+    @staticmethod
+    def hash_pdf(filename:str=None, stream:bytes=None):
+        '''Hash of pdf content, given by either file name or stream.'''
+        digest = hashlib.sha256()
+        if stream:
+            digest.update(stream)
+        else:
+            with open(filename, 'rb') as f:
+                for chunk in iter(lambda: f.read(1<<20), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+
+    @staticmethod
+    def hash_settings(settings:dict, default_settings:dict):
+        '''Hash of the parameters overriding default settings, plus parser and PyMuPDF version.'''
+        overrides = {
+            k: v for k, v in settings.items()
+            if k not in PagesCache.IGNORED_SETTINGS and default_settings.get(k, None)!=v
+        }
+        overrides['parser_version'] = PARSER_VERSION
+        overrides['fitz_version'] = fitz.VersionBind
+        data = json.dumps(overrides, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+    def get(self, page_index:int):
+        '''Parsed page in dict format, or None if not cached.'''
+        filename = self._filename(page_index)
+        if not os.path.exists(filename): return None
+        try:
+            with open(filename, 'rb') as f:
+                return serialization.loads(f.read())
+        except Exception as e:
+            logging.warning('Ignore cached page %d due to loading error: %s', page_index+1, e)
+            return None
+
+
+    def set(self, page_index:int, raw_page:dict):
+        '''Store parsed page in dict format.'''
+        os.makedirs(self.path, exist_ok=True)
+
+        # write to a temporary file first, so that a broken file is never left for other processes
+        filename = self._filename(page_index)
+        tmp_filename = f'{filename}.{os.getpid()}.tmp'
+        with open(tmp_filename, 'wb') as f:
+            f.write(serialization.dumps(raw_page))
+        os.replace(tmp_filename, filename)
+
+
+    def _filename(self, page_index:int):
+        return os.path.join(self.path, f'{page_index}.bin')
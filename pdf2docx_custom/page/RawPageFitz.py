@@ -4,19 +4,27 @@
 A wrapper of PyMuPDF Page as page engine.
 '''
 
+import bisect
 import logging
 from .RawPage import RawPage
 from ..image.ImagesExtractor import ImagesExtractor
 from ..shape.Paths import Paths
-from ..common.constants import FACTOR_A_HALF
+from ..common.constants import FACTOR_A_HALF, TEXT_EXTRACTION_LEVELS
 from ..common.Element import Element
-from ..common.share import (RectType, debug_plot)
+from ..common.share import (RectType, debug_plot, decode, lazyproperty)
 from ..common.algorithm import get_area
 
 
 class RawPageFitz(RawPage):
     '''A wrapper of ``fitz.Page`` to extract source contents.'''
 
+    @lazyproperty
+    def images_extractor(self):
+        '''Images extractor shared by extracting images and vector graphics of this page, so
+        that page text is hidden only once before clipping page.'''
+        return ImagesExtractor(self.page_engine)
+
+
     def extract_raw_dict(self, **settings):
         raw_dict = {}
         if not self.page_engine: return raw_dict
@@ -30,12 +38,17 @@ class RawPageFitz(RawPage):
         text_blocks = self._preprocess_text(**settings)
         raw_dict['blocks'] = text_blocks
 
-        image_blocks = self._preprocess_images(**settings)
-        raw_dict['blocks'].extend(image_blocks)
-        
-        shapes, images =  self._preprocess_shapes(**settings)
-        raw_dict['shapes'] = shapes
-        raw_dict['blocks'].extend(images)
+        # NOTE: page text might be hidden when clipping page, so restore it finally to keep
+        # the document unmodified
+        try:
+            image_blocks = self._preprocess_images(**settings)
+            raw_dict['blocks'].extend(image_blocks)
+            
+            shapes, images =  self._preprocess_shapes(**settings)
+            raw_dict['shapes'] = shapes
+            raw_dict['blocks'].extend(images)
+        finally:
+            self.images_extractor.restore_page_text()
 
         hyperlinks = self._preprocess_hyperlinks()
         raw_dict['shapes'].extend(hyperlinks)        
@@ -58,10 +71,31 @@ class RawPageFitz(RawPage):
         ocr = settings['ocr']
         if ocr==1: raise SystemExit("OCR feature is planned but not implemented yet.")
 
+        level = settings['text_extraction_level']
+        if level not in TEXT_EXTRACTION_LEVELS:
+            raise ValueError(f"Invalid text extraction level: {level}.")
+
         # all text blocks no matter hidden or not
-        raw = self.page_engine.get_text('rawdict', flags=64)
-        text_blocks = raw.get('blocks', [])
+        # NOTE: chars are extracted only if necessary, otherwise rebuilt from span text on demand
+        option = 'rawdict' if level=='chars' else 'dict'
+        raw = self.page_engine.get_text(option, flags=64)
+        text_blocks = self._filter_hidden_text(raw.get('blocks', []), ocr)
+
+        # in case unicode in font name
+        # NOTE: decode it here rather than in ``TextSpan``, which is also restored from decoded 
+        # font name, e.g. parsed page from cache
+        for block in text_blocks:
+            for line in block['lines']:
+                for span in line['spans']: span['font'] = decode(span['font'])
 
+        # merge spans in line, e.g. only line bbox is concerned
+        if level=='lines': RawPageFitz._merge_line_spans(text_blocks)
+
+        return text_blocks
+
+
+    def _filter_hidden_text(self, text_blocks:list, ocr:int):
+        '''Ignore hidden text if ``ocr=0``, while extract only hidden text if ``ocr=2``.'''
         # potential UnicodeDecodeError issue when trying to filter hidden text:
         # https://github.com/dothinking/pdf2docx/issues/144
         # https://github.com/dothinking/pdf2docx/issues/155
@@ -73,32 +107,20 @@ class RawPageFitz(RawPage):
         
         if not spans: return text_blocks
 
-        # ignore hidden text if ocr=0, while extract only hidden text if ocr=2
         if ocr==2:
             f = lambda span: span['type']!=3  # find displayed text and ignore it
         else:
             f = lambda span: span['type']==3  # find hidden text and ignore it
         filtered_spans = list(filter(f, spans))
-        
-        def span_area(bbox):
-            x0, y0, x1, y1 = bbox
-            return (x1-x0) * (y1-y0)
+        if not filtered_spans: return text_blocks
+        index = RawPageFitz._index_spans(filtered_spans)
 
         # filter blocks by checking span intersection: mark the entire block if 
         # any span is matched
         blocks = []
         for block in text_blocks:
-            intersected = False
-            for line in block['lines']:
-                for span in line['spans']:
-                    for filter_span in filtered_spans:
-                        intersected_area = get_area(span['bbox'], filter_span['bbox'])
-                        if intersected_area / span_area(span['bbox']) >= FACTOR_A_HALF \
-                            and span['font']==filter_span['font']:
-                            intersected = True
-                            break
-                    if intersected: break # skip further span check if found
-                if intersected: break     # skip further line check
+            intersected = any(RawPageFitz._is_span_matched(span, index) \
+                for line in block['lines'] for span in line['spans'])
 
             # keep block if no any intersection with filtered span
             if not intersected: blocks.append(block)
@@ -106,6 +128,59 @@ class RawPageFitz(RawPage):
         return blocks
 
 
+    @staticmethod
+    def _merge_line_spans(text_blocks:list):
+        '''Merge spans of each line into one span in place, which takes the line bbox and the
+        font properties of the span with the longest text.'''
+        for block in text_blocks:
+            for line in block['lines']:
+                spans = line['spans']
+                if len(spans)<2: continue
+                span = dict(max(spans, key=lambda span: len(span['text'])))
+                span['bbox'] = line['bbox']
+                span['text'] = ''.join(span['text'] for span in spans)
+                line['spans'] = [span]
+
+
+    @staticmethod
+    def _index_spans(spans:list):
+        '''Index spans by font and then sort by top border, so as to find spans intersected with
+        a certain bbox quickly.
+
+        Returns:
+            dict: ``{font: (sorted top borders, sorted bboxes, max height)}``
+        '''
+        groups = {}
+        for span in spans:
+            groups.setdefault(span['font'], []).append(tuple(span['bbox']))
+
+        index = {}
+        for font, bboxes in groups.items():
+            bboxes.sort(key=lambda bbox: bbox[1])
+            max_height = max(bbox[3]-bbox[1] for bbox in bboxes)
+            index[font] = ([bbox[1] for bbox in bboxes], bboxes, max_height)
+        return index
+
+
+    @staticmethod
+    def _is_span_matched(span:dict, index:dict):
+        '''Whether ``span`` is mostly covered, i.e. at least half of its area, by any indexed 
+        span with the same font.'''
+        if span['font'] not in index: return False
+        tops, bboxes, max_height = index[span['font']]
+
+        x0, y0, x1, y1 = span['bbox']
+        area = (x1-x0) * (y1-y0)
+        if area<=0: return False
+
+        # only spans with top border in range (y0-max_height, y1) might intersect vertically
+        start = bisect.bisect_right(tops, y0-max_height)
+        end = bisect.bisect_left(tops, y1)
+        for bbox in bboxes[start:end]:
+            if get_area(span['bbox'], bbox) / area >= FACTOR_A_HALF: return True
+        return False
+
+
     def _preprocess_images(self, **settings):
         '''Extract image blocks. Image block extracted by ``page.get_text('rawdict')`` doesn't 
         contain alpha channel data, so it has to get page images by ``page.get_images()`` and 
@@ -114,8 +189,11 @@ class RawPageFitz(RawPage):
         '''
         # ignore image if ocr-ed pdf: get ocr-ed text only
         if settings['ocr']==2: return []
+
+        # images are not involved in detecting table position
+        if settings['locate_tables_only']: return []
         
-        return ImagesExtractor(self.page_engine).extract_images(settings['clip_image_res_ratio'])
+        return self.images_extractor.extract_images(settings['clip_image_res_ratio'])
 
 
     def _preprocess_shapes(self, **settings):
@@ -126,7 +204,8 @@ class RawPageFitz(RawPage):
             settings['min_svg_gap_dy'], 
             settings['min_svg_w'], 
             settings['min_svg_h'], 
-            settings['clip_image_res_ratio'])
+            settings['clip_image_res_ratio'],
+            not settings['locate_tables_only'])
     
 
     @debug_plot('Source Paths')
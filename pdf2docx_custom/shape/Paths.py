@@ -11,7 +11,6 @@ Square and Highlight considered.
 '''
 
 import fitz
-from ..image.ImagesExtractor import ImagesExtractor
 from ..common.share import lazyproperty
 from ..common.Collection import  Collection
 from .Path import Path
@@ -74,7 +73,8 @@ class Paths(Collection):
 
 
     def to_shapes_and_images(self, min_svg_gap_dx:float=15, min_svg_gap_dy:float=15, 
-                                min_w:float=2, min_h:float=2, clip_image_res_ratio:float=3.0):
+                                min_w:float=2, min_h:float=2, clip_image_res_ratio:float=3.0,
+                                clip_image:bool=True):
         '''Convert paths to iso-oriented shapes or images. The semantic type of path is either table/text style or 
         vector graphic. This method is to:
         * detect svg regions -> exist at least one non-iso-oriented path
@@ -87,6 +87,7 @@ class Paths(Collection):
             min_w (float): Ignore contours if the bbox width is less than this value.
             min_h (float): Ignore contours if the bbox height is less than this value.
             clip_image_res_ratio (float, optional): Resolution ratio of clipped bitmap. Defaults to 3.0.
+            clip_image (bool, optional): Clip svg regions to bitmap or not. Defaults to True.
 
         Returns:
             tuple: (list of shape raw dict, list of image raw dict).
@@ -99,7 +100,7 @@ class Paths(Collection):
 
         # detect svg with python opencv
         images = []
-        ie = ImagesExtractor(self.parent.page_engine)
+        ie = self.parent.images_extractor
         groups = ie.detect_svg_contours(min_svg_gap_dx, min_svg_gap_dy, min_w, min_h)
 
         # `bbox` is the external bbox of current region, while `inner_bboxes` are the inner contours
@@ -125,11 +126,12 @@ class Paths(Collection):
             # all iso-oriented paths -> it's a table, but might contain svg in cell as well
             if paths.is_iso_oriented:
                 iso_shapes.extend(paths.to_shapes())
+                if not clip_image: continue
                 for svg_bbox in inner_bboxes:
                     images.append(ie.clip_page_to_dict(fitz.Rect(svg_bbox), clip_image_res_ratio))
             
             # otherwise, it's a svg
-            else:
+            elif clip_image:
                 images.append(ie.clip_page_to_dict(fitz.Rect(bbox), clip_image_res_ratio))
 
         return iso_shapes, images
@@ -205,7 +205,10 @@ class Shapes(ElementCollection):
         # group by color and connectivity (with margin considered)
         def f(a, b):
             return a.color==b.color and a.bbox.intersects(b.get_expand_bbox(constants.TINY_DIST))
-        groups = Collection(normal_shapes).group(f)
+        def projection(a):
+            x0, _, x1, _ = a.bbox
+            return x0-constants.TINY_DIST, x1+constants.TINY_DIST
+        groups = Collection(normal_shapes).group(f, projection)
 
         merged_shapes = []
         for group in groups:
@@ -22,6 +22,7 @@ determined.
     Consider horizontal and vertical borders only.
 '''
 
+import bisect
 from collections import defaultdict
 from ..shape.Shapes import Shapes
 from ..shape.Shape import Stroke
@@ -295,14 +296,56 @@ class Borders(BaseCollection):
     
     def _finalize_by_strokes(self, strokes:list):
         '''Finalize borders by explicit strokes.'''
+        # horizontal stroke can finalize horizontal border only
+        h_index = Borders._index_borders(list(filter(lambda border: border.is_horizontal, self._instances)))
+        v_index = Borders._index_borders(list(filter(lambda border: not border.is_horizontal, self._instances)))
+
         for stroke in strokes:
             if stroke.is_determined: continue
+
+            # only borders with valid range covering the stroke position are affected
+            if stroke.horizontal:
+                candidates = Borders._get_indexed_borders(h_index, stroke.y0)
+            else:
+                candidates = Borders._get_indexed_borders(v_index, stroke.x0)
             
-            for border in self._instances:
-                # horizontal stroke can finalize horizontal border only
-                if stroke.horizontal != border.is_horizontal: continue
-                
-                border.finalize_by_stroke(stroke)                
+            for border in candidates:
+                border.finalize_by_stroke(stroke)
+
+
+    @staticmethod
+    def _index_borders(borders:list):
+        '''Index borders by valid range, i.e. ``Border.is_valid()``, so as to get borders
+        covering a certain position quickly.
+
+        The sorted end points of all valid ranges split the axis into slots: the end points
+        themselves and the open intervals between them. Each slot holds the borders covering 
+        it, in the same order as ``borders``.
+
+        Returns:
+            tuple: ``(sorted end points, borders in each slot)``.
+        '''
+        ranges = [(border.LRange-constants.MINOR_DIST, border.URange+constants.MINOR_DIST) \
+                    for border in borders]
+        points = sorted(set(x for x_range in ranges for x in x_range))
+        positions = {x: i for i, x in enumerate(points)}
+
+        # slot 2i+1 is the i-th point, while slot 2i is the interval before it
+        slots = [[] for _ in range(2*len(points)+1)]
+        for border, (x0, x1) in zip(borders, ranges):
+            for i in range(2*positions[x0]+1, 2*positions[x1]+2):
+                slots[i].append(border)
+        
+        return points, slots
+
+
+    @staticmethod
+    def _get_indexed_borders(index:tuple, value:float):
+        '''Get borders with valid range covering ``value`` from ``_index_borders()``.'''
+        points, slots = index
+        i = bisect.bisect_left(points, value)
+        if i<len(points) and points[i]==value: return slots[2*i+1]
+        return slots[2*i]
 
 
     @staticmethod
@@ -26,7 +26,8 @@ Data Structure::
                 ]
             }, # end of row
             {...} # more rows
-        ] # end of row
+        ], # end of row
+        'confidence': float
     }
 '''
 
@@ -49,6 +50,9 @@ class TableBlock(Block):
         # lattice table by default
         self.set_lattice_table_block()
 
+        # confidence score calculated when parsing, see ``confidence``
+        self._confidence = raw.get('confidence', None)
+
     def __getitem__(self, idx):
         try:
             row = self._rows[idx]
@@ -83,6 +87,39 @@ class TableBlock(Block):
         '''
         return [ [cell.text for cell in row] for row in self._rows ]
 
+    @property
+    def confidence(self):
+        '''A rough score in ``[0, 1]`` that this block is a complete table, based on the
+        parsed structure only:
+
+        * border completeness: ratio of cell sides with explicit border;
+        * cell fill: ratio of cells with contents;
+        * merged-cell ratio: too many merged cells indicates a frame rather than a table.
+
+        A single cell is more likely a text frame, while a single row/column might be 
+        separator lines, so they're scored low.
+
+        .. note::
+            The score is stored with the table, since cell contents in table-locate mode, i.e. 
+            text lines not parsed into blocks yet, can't be restored from stored data.
+        '''
+        if self._confidence is not None: return self._confidence
+
+        num = self.num_rows * self.num_cols
+        if num<=1: return 0.0
+
+        cells = [cell for row in self._rows for cell in row]
+        valid_cells = [cell for cell in cells if cell] # merged cells are empty
+        if not valid_cells: return 0.0
+
+        merged_ratio = 1.0 - len(valid_cells)/len(cells)
+        border_ratio = sum(1 for cell in valid_cells for w in cell.border_width if w) / (4*len(valid_cells))
+        fill_ratio = sum(1 for cell in valid_cells if cell.blocks) / len(valid_cells)
+
+        score = 0.4*border_ratio + 0.3*fill_ratio + 0.3*(1.0-merged_ratio)
+        if min(self.num_rows, self.num_cols)==1: score *= 0.6
+        return round(score, 2)
+
     @property
     def outer_bbox(self):
         '''Outer bbox with border considered.'''
@@ -104,7 +141,8 @@ class TableBlock(Block):
     def store(self):
         res = super().store()
         res.update({
-            'rows': self._rows.store()
+            'rows': self._rows.store(),
+            'confidence': self.confidence
         })
         return res
 
@@ -7,7 +7,7 @@ import fitz
 from ..common.Element import Element
 from ..common.share import RectType
 from ..common import constants
-from ..shape.Shape import Shape, Stroke
+from ..shape.Shape import Stroke
 from ..shape.Shapes import Shapes
 from .TableBlock import TableBlock
 from .Row import Row
@@ -346,32 +346,47 @@ class TableStructure:
             y2  +--------h6--------+----h7---+
 
         '''
-        def group_strokes(stroke:Shape, strokes:dict):
-            # y-coordinate of h-strokes or x-coordinate of v-strokes
-            t = round(stroke.y0, 1) if stroke.horizontal else round(stroke.x0, 1)
-
-            # ignore minor error resulting from different stroke width
-            for t_ in strokes:
-                if abs(t-t_)>min_border_clearance: continue
-                t = (t_+t)/2.0 # average
-                strokes[t] = strokes.pop(t_)
-                strokes[t].append(stroke)
-                break
-            else:
-                strokes[t] = Shapes([stroke])
+        def group_strokes(items:list):
+            # items: (y-coordinate of h-stroke or x-coordinate of v-stroke, stroke) in drawing order
+
+            # ignore minor error resulting from different stroke width: merge sorted coordinates 
+            # into current cluster if close to its running average, otherwise start a new one
+            clusters = [] # type: list [list[float, list[int]]]
+            for i in sorted(range(len(items)), key=lambda i: items[i][0]):
+                t = items[i][0]
+                if clusters and t-clusters[-1][0]<=min_border_clearance:
+                    clusters[-1][0] = (clusters[-1][0]+t)/2.0 # average
+                    clusters[-1][1].append(i)
+                else:
+                    clusters.append([t, [i]])
+
+            # the coordinate of each group is averaged stroke by stroke in drawing order, 
+            # and strokes keep drawing order in each group
+            groups = {} # type: dict [float, Shapes]
+            for _, indexes in clusters:
+                indexes.sort()
+                t = items[indexes[0]][0]
+                for i in indexes[1:]: t = (t+items[i][0])/2.0
+                groups[t] = Shapes([items[i][1] for i in indexes])
+            return groups
         
-        h_strokes = {} # type: dict [float, Shapes]
-        v_strokes = {} # type: dict [float, Shapes]
+        # collect h/v-strokes with their coordinates, and the table region
+        h_items, v_items = [], []
         X0, Y0, X1, Y1 = float('inf'), float('inf'), -float('inf'), -float('inf')
         for stroke in strokes:
-            # group horizontal/vertical strokes in each row/column
-            group_strokes(stroke, h_strokes if stroke.horizontal else v_strokes)
-
-            # update table region
-            X0 = min(X0, stroke.x0)
-            X1 = max(X1, stroke.x1)
-            Y0 = min(Y0, stroke.y0)
-            Y1 = max(Y1, stroke.y1)
+            x0, y0, x1, y1 = stroke.x0, stroke.y0, stroke.x1, stroke.y1
+            if stroke.horizontal:
+                h_items.append((round(y0, 1), stroke))
+            else:
+                v_items.append((round(x0, 1), stroke))
+            X0 = min(X0, x0)
+            X1 = max(X1, x1)
+            Y0 = min(Y0, y0)
+            Y1 = max(Y1, y1)
+
+        # group horizontal/vertical strokes in each row/column
+        h_strokes = group_strokes(h_items)
+        v_strokes = group_strokes(v_items)
 
         # at least 2 inner strokes exist
         if not h_strokes or not v_strokes: return None, None
@@ -55,8 +55,10 @@ class TablesConstructor:
         def remove_overlap(instances:list):
             '''Delete group when it's contained in a certain group.'''
             # group instances if contained in other instance
+            # NOTE: an empty bbox might be contained in any bbox, so check it with all the others
             fun = lambda a, b: a.bbox.contains(b.bbox) or b.bbox.contains(a.bbox)
-            groups = Collection(instances).group(fun)
+            projection = lambda a: None if a.bbox.is_empty else (a.bbox.x0, a.bbox.x1)
+            groups = Collection(instances).group(fun, projection)
             unique_groups = []
             for group_instances in groups:
                 if len(group_instances)==1: 
@@ -19,6 +19,9 @@ from ..shape.Shape import Shape
 
 class Char(Element):
     '''Object representing a character.'''
+
+    __slots__ = ('c', 'origin')
+
     def __init__(self, raw:dict=None):
         if raw is None: raw = {}
 
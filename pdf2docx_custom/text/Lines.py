@@ -116,14 +116,14 @@ class Lines(ElementCollection):
             # last char in this line
             end_span = line.spans[-1]
             if not isinstance(end_span, TextSpan): continue
-            end_chars = end_span.chars
+            end_chars = end_span.rebuild_chars()
             if not end_chars: continue 
             end_char = end_chars[-1]
 
             # first char in next line
             start_span = self._instances[i+1].spans[0]
             if not isinstance(start_span, TextSpan): continue
-            start_chars = start_span.chars
+            start_chars = start_span.rebuild_chars()
             if not start_chars: continue 
             next_start_char = start_chars[0]            
 
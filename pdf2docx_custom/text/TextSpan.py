@@ -27,12 +27,13 @@ this `link <https://pymupdf.readthedocs.io/en/latest/textpage.html>`_::
     }
 '''
 
+import copy
 import fitz
 from docx.shared import Pt, RGBColor
 from docx.oxml.ns import qn
 from .Char import Char
 from ..common.Element import Element
-from ..common.share import (RectType, rgb_value, rgb_component, decode)
+from ..common.share import (RectType, rgb_value, rgb_component)
 from ..common import constants
 from ..common import docx
 from ..shape.Shape import Shape
@@ -40,6 +41,10 @@ from ..shape.Shape import Shape
 
 class TextSpan(Element):
     '''Object representing text span.'''
+
+    __slots__ = ('color', 'flags', 'chars', '_text', 'font', 'size', 'ascender', 'descender',
+                 'line_height', 'style', 'char_spacing')
+
     def __init__(self, raw:dict=None):
         raw = raw or {}
         self.color = raw.get('color', 0)
@@ -54,7 +59,7 @@ class TextSpan(Element):
         # font metrics
         # line_height is the standard single line height used in relative line spacing,
         # while exact line spacing is used when line_height==-1 by default.
-        self.font = decode(raw.get('font', '')) # in case unicode in font name
+        self.font = raw.get('font', '') # decoded already when extracting, see ``RawPageFitz``
         self.size = raw.get('size', 12.0)
         self.ascender = raw.get('ascender', 1.0)
         self.descender = raw.get('descender', 0.0)
@@ -146,6 +151,37 @@ class TextSpan(Element):
             char.update_bbox((x0, y0, x1, y1))
 
 
+    def rebuild_chars(self):
+        '''Rebuild chars from span text in case they're not extracted, e.g. text extracted in 
+        span or line level. The span bbox is divided evenly along text direction, so char bbox 
+        is an estimation only.
+
+        Returns:
+            list: Chars of this span.
+        '''
+        if self.chars or not self._text: return self.chars
+
+        # ignore invalid and replacement characters as extracting chars
+        chars = [Char({'c': c}) for c in self._text]
+        chars = [char for char in chars if char.c not in ('', '\ufffd')]
+        if not chars: return self.chars
+
+        # from left to right, or from bottom to top
+        horizontal = self.parent is None or self.parent.is_horizontal_text
+        x0, y0, x1, y1 = self.bbox
+        n = len(chars)
+        for i, char in enumerate(chars):
+            if horizontal:
+                w = (x1-x0) / n
+                char.update_bbox((x0+i*w, y0, x0+(i+1)*w, y1))
+            else:
+                h = (y1-y0) / n
+                char.update_bbox((x0, y1-(i+1)*h, x1, y1-i*h))
+
+        self.chars = chars
+        return self.chars
+
+
     def add(self, char:Char):
         '''Add char and update bbox accordingly.'''
         self.chars.append(char)
@@ -159,6 +195,7 @@ class TextSpan(Element):
 
         # keep one blank
         num_blanks = len(original_text) - len(original_text.lstrip())
+        self.rebuild_chars()
         self.chars = self.chars[num_blanks-1:]
         self.update_bbox(rect=self.cal_bbox())
         return True
@@ -171,6 +208,7 @@ class TextSpan(Element):
 
         # keep one blank
         num_blanks = len(original_text) - len(original_text.rstrip())
+        self.rebuild_chars()
         self.chars = self.chars[:1-num_blanks]
         self.update_bbox(rect=self.cal_bbox())
         return True
@@ -230,7 +268,7 @@ class TextSpan(Element):
         # calculate chars in the format rectangle
         # combine an index with enumerate(), so the second element is the char
         f = lambda items: items[1].contained_in_rect(rect, horizontal)
-        index_chars = list(filter(f, enumerate(self.chars)))
+        index_chars = list(filter(f, enumerate(self.rebuild_chars())))
 
         # then we get target chars in a sequence
         pos = index_chars[0][0] if index_chars else -1 # start index -1 if nothing found
@@ -244,15 +282,13 @@ class TextSpan(Element):
                 bbox = (self.bbox.x0, self.bbox.y0, intsec.x0, self.bbox.y1)
             else:
                 bbox = (self.bbox.x0, intsec.y1, self.bbox.x1, self.bbox.y1)
-            split_span = self.copy().update_bbox(bbox)
-            split_span.chars = self.chars[0:pos]
+            split_span = self._slice(0, pos, bbox)
             split_spans.append(split_span)
 
         # middle intersection part if exists
         if length > 0:
             bbox = (intsec.x0, intsec.y0, intsec.x1, intsec.y1)
-            split_span = self.copy().update_bbox(bbox)
-            split_span.chars = self.chars[pos:pos_end]            
+            split_span = self._slice(pos, pos_end, bbox)
             split_span._parse_text_format(rect, horizontal)  # update style
             split_spans.append(split_span)
 
@@ -262,13 +298,33 @@ class TextSpan(Element):
                 bbox = (intsec.x1, self.bbox.y0, self.bbox.x1, self.bbox.y1)
             else:
                 bbox = (self.bbox.x0, self.bbox.y0, self.bbox.x1, intsec.y0)
-            split_span = self.copy().update_bbox(bbox)
-            split_span.chars = self.chars[pos_end:]
+            split_span = self._slice(pos_end, len(self.chars), bbox)
             split_spans.append(split_span)
 
         return split_spans
 
 
+    def _slice(self, start:int, end:int, bbox):
+        """Create a lightweight copy of this span with chars in range ``[start, end)``.
+
+        Font properties are shared with this span, and so are the chars, while bbox and style 
+        are its own. It's much faster than ``copy()``, which deep copies all chars.
+
+        Args:
+            start (int): Index of the first char.
+            end (int): Index after the last char.
+            bbox (tuple): bbox of the new span, in real page CS.
+
+        Returns:
+            TextSpan: The new span.
+        """
+        span = copy.copy(self)
+        span.parent = None
+        span.chars = self.chars[start:end]
+        span.style = [dict(style) for style in self.style]
+        return span.update_bbox(bbox)
+
+
     def _parse_text_format(self, rect:Shape, horizontal:bool=True):
         """Parse text style based on the position to a rect shape.
 
@@ -346,11 +402,9 @@ class TextSpan(Element):
             return TextSpan()
 
         # further check chars in span
-        span = self.copy()
-        span.chars.clear()
-        span.update_bbox((0.0,0.0,0.0,0.0))
+        span = self._slice(0, 0, (0.0,0.0,0.0,0.0))
 
-        for char in self.chars:
+        for char in self.rebuild_chars():
             if char.get_main_bbox(rect, constants.FACTOR_A_HALF): # contains at least a half part
                 span.chars.append(char)
                 span.union_bbox(char)
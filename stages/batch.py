@@ -0,0 +1,88 @@
+import os
+from dotenv import load_dotenv
+from default.prompt import table_extraction_prompt
+from llm.claude_batch import CLAUDEBatch
+from .pdf import Pdf, TABLE_IMAGE_CHECK_PROMPT
+from .image import Image2table
+
+
+class BatchExtraction:
+    """
+    離線大量處理：用 Anthropic Message Batches API 執行第一階段（表格圖片檢查）與第二階段（表格轉 HTML）。
+    第二階段需要第一階段的結果，因此每個階段各送出一個 batch，所有 PDF 的請求合併在同一個 batch 中。
+    """
+    def __init__(self, api_key, base_url=None, poll_interval=60, table_image_check_prompt="", image_detection_prompt=""):
+        if not api_key:
+            raise ValueError("API key is required to initialize the LLM.")
+        self.batch_llm = CLAUDEBatch(api_key, base_url=base_url, poll_interval=poll_interval)
+        self.pdf = Pdf(llm_name="claude", api_key=api_key)
+        self.table_image_check_prompt = table_image_check_prompt or TABLE_IMAGE_CHECK_PROMPT
+        self.image_detection_prompt = image_detection_prompt or table_extraction_prompt
+
+    def extract_tables(self, pdf_paths, table_image_dir="table_images", temp_image_dir="temp_images", confidence_thresholds=(0.2, 0.85)):
+        """
+        第一階段：擷取所有 PDF 的表格圖片，無法在本機判定的圖片合併成一個 batch 檢查。
+
+        Returns:
+            dict: {pdf_path: [表格圖片路徑, ...]}
+        """
+        os.makedirs(table_image_dir, exist_ok=True)
+        os.makedirs(temp_image_dir, exist_ok=True)
+        captured_paths, decisions = {}, {}
+        for pdf_path in pdf_paths:
+            captured = self.pdf._capture_table_images(pdf_path, output_dir=temp_image_dir) or []
+            source_paths = [info['path'] for info in captured]
+            captured_paths[pdf_path] = source_paths
+            decisions.update(self.pdf._decide_locally(source_paths, self.pdf._captured_confidences(captured), confidence_thresholds))
+            for source_path in source_paths:
+                if source_path not in decisions:
+                    self.batch_llm.add_request(source_path, prompt=self.table_image_check_prompt, image_path=source_path)
+
+        decisions.update(self.batch_llm.run())
+        return {
+            pdf_path: self.pdf._collect_table_images(source_paths, decisions, table_image_dir)
+            for pdf_path, source_paths in captured_paths.items()
+        }
+
+    def process_images(self, image_paths, html_dir=""):
+        """
+        第二階段：所有表格圖片合併成一個 batch 轉成 HTML。
+
+        Returns:
+            dict: {圖片路徑: HTML 路徑}，轉換失敗的圖片不會出現在結果中。
+        """
+        for image_path in image_paths:
+            self.batch_llm.add_request(image_path, prompt=self.image_detection_prompt, image_path=image_path)
+
+        results = self.batch_llm.run()
+        html_paths = {}
+        for image_path in image_paths:
+            res = results.get(image_path)
+            if not res:
+                print(f"Failed to generate the HTML content for {image_path}.")
+                continue
+            html_path = Image2table.html_path(image_path, html_dir)
+            Image2table.save_html(res, html_path)
+            html_paths[image_path] = html_path
+        return html_paths
+
+    def run(self, pdf_paths, table_image_dir="table_images", temp_image_dir="temp_images", html_dir=""):
+        if isinstance(pdf_paths, str):
+            pdf_paths = [pdf_paths]
+        tables = self.extract_tables(pdf_paths, table_image_dir, temp_image_dir)
+        image_paths = [path for paths in tables.values() for path in paths]
+        return self.process_images(image_paths, html_dir)
+
+
+def main(*pdf_paths, base_url=None, poll_interval=60, table_image_dir="table_images", html_dir=""):
+    """
+    python -m stages.batch a.pdf b.pdf [--base_url=http://localhost:8000]
+    """
+    load_dotenv()
+    batch = BatchExtraction(os.getenv("ANTHROPIC_API_KEY"), base_url=base_url, poll_interval=poll_interval)
+    return batch.run(list(pdf_paths), table_image_dir=table_image_dir, html_dir=html_dir)
+
+
+if __name__ == "__main__":
+    import fire
+    fire.Fire(main)
@@ -31,12 +31,15 @@ class Image2table:
         若他的排版是錯誤的，請替我修正格式後再重新回應一個新的 html 格式表格。
         請注意不要隨意刪除儲存格內容。
         """
-    def image_process(self, image_path, html_dir = ""):
+    @staticmethod
+    def html_path(image_path, html_dir = ""):
         if html_dir == "":
             html_dir = "./html"
         os.makedirs(html_dir, exist_ok=True)
-        html_path = f"{html_dir}/{os.path.splitext(os.path.basename(image_path))[0]}.html"
-        res = self.llm.generate(prompt=self.image_detection_prompt, image_path = image_path)
+        return f"{html_dir}/{os.path.splitext(os.path.basename(image_path))[0]}.html"
+
+    @staticmethod
+    def save_html(res, html_path):
         if res:
             # Save the HTML content to a file
             with open(html_path, "w", encoding="utf-8") as file:
@@ -44,6 +47,20 @@ class Image2table:
             print(f"HTML table has been saved to {html_path}")
         else:
             print("Failed to generate the HTML content.") 
+
+    def image_process(self, image_path, html_dir = "", on_update = None):
+        """
+        on_update (callable): 若提供，改用串流產生 HTML，每收到一段文字就以目前累積的內容呼叫 on_update(text)。
+        """
+        html_path = self.html_path(image_path, html_dir)
+        if on_update is None:
+            res = self.llm.generate(prompt=self.image_detection_prompt, image_path = image_path)
+        else:
+            res = ""
+            for text in self.llm.generate_stream(prompt=self.image_detection_prompt, image_path = image_path):
+                res += text
+                on_update(res)
+        self.save_html(res, html_path)
         #os.remove(image_path)
         return html_path
 
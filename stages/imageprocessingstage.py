@@ -1,5 +1,7 @@
 # image_processing_stage.py
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import streamlit as st
 from default.prompt import table_extraction_prompt
 from .image import Image2table
@@ -59,6 +61,14 @@ class ImageProcessingStage:
                 key="image_prompt_input"
             )
             
+            image_max_workers = st.number_input(
+                "同時進行的表格轉錄請求數上限 (第二階段):",
+                min_value=1,
+                max_value=16,
+                value=4,
+                step=1,
+                key="image_max_workers"
+            )
             process_images_button = st.button("Process Extracted Images (第二階段)", key="image_run_button")
             
             image_api_key = None
@@ -96,7 +106,10 @@ class ImageProcessingStage:
                     )
                     failed_images = []
                     total_images = sum(len(paths) for paths in st.session_state["extracted_images"].values())
-                    processed_count = 0
+                    progress_bar = st.progress(0.0)
+
+                    # 先依序排好每張圖片的位置，結果完成後再填入對應的欄位
+                    placeholders = []
                     for pdf_name, image_paths in st.session_state["extracted_images"].items():
                         if not image_paths:
                             continue
@@ -106,19 +119,56 @@ class ImageProcessingStage:
                             with col1:
                                 st.image(image_path, caption=f"Extracted Image: {os.path.basename(image_path)}", use_container_width=True)
                             with col2:
-                                try:
-                                    result = image2table.image_process(image_path=image_path)
-                                    st.write("Extracted Table:")
-                                    st.html(result)
-                                    # 若 image2table.image_process 產生 HTML 檔案，請將檔案路徑記錄至 st.session_state["generated_html"]
-                                    # 例如：
-                                    # html_path = save_html_result(result)
-                                    # st.session_state.setdefault("generated_html", []).append(html_path)
-                                except Exception as e:
-                                    failed_images.append(image_path)
-                                    st.error(f"Error processing image {image_path}: {e}")
-                            processed_count += 1
-                            st.progress(processed_count / total_images)
+                                placeholders.append((image_path, st.empty()))
+
+                    # 同時處理所有圖片：串流中的部分結果即時顯示，依完成順序顯示最終結果與進度
+                    # NOTE: Streamlit 元件只能在主執行緒更新，worker 只把部分結果放進 queue
+                    updates = queue.Queue()
+                    processed_count = 0
+                    finished = set()
+                    with ThreadPoolExecutor(max_workers=int(image_max_workers)) as executor:
+                        futures = {
+                            executor.submit(
+                                image2table.image_process,
+                                image_path=image_path,
+                                on_update=lambda text, image_path=image_path: updates.put((image_path, text))
+                            ): (image_path, placeholder)
+                            for image_path, placeholder in placeholders
+                        }
+                        placeholder_by_path = dict(placeholders)
+                        pending = set(futures)
+                        while pending:
+                            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                            # 只顯示每張圖片最新的部分結果
+                            latest = {}
+                            while not updates.empty():
+                                image_path, text = updates.get_nowait()
+                                latest[image_path] = text
+                            for image_path, text in latest.items():
+                                if image_path in finished:
+                                    continue
+                                with placeholder_by_path[image_path].container():
+                                    st.write("Extracting Table...")
+                                    st.html(text)
+
+                            for future in done:
+                                image_path, placeholder = futures[future]
+                                finished.add(image_path)
+                                with placeholder.container():
+                                    try:
+                                        result = future.result()
+                                        st.write("Extracted Table:")
+                                        st.html(result)
+                                        # 若 image2table.image_process 產生 HTML 檔案，請將檔案路徑記錄至 st.session_state["generated_html"]
+                                        # 例如：
+                                        # html_path = save_html_result(result)
+                                        # st.session_state.setdefault("generated_html", []).append(html_path)
+                                    except Exception as e:
+                                        failed_images.append(image_path)
+                                        st.error(f"Error processing image {image_path}: {e}")
+                                processed_count += 1
+                                progress_bar.progress(processed_count / total_images)
                     if failed_images:
                         st.warning("The following images failed to process:")
                         st.write(failed_images)
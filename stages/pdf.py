@@ -1,13 +1,18 @@
 from dotenv import load_dotenv
+import json
+import re
 import shutil
 import os
 from llm.claude import CLAUDE
 from llm.gemini import GEMINI
 from datetime import datetime
-import fitz  # PyMuPDF
+from concurrent.futures import ThreadPoolExecutor
 import os
 from pdf2docx_custom import Converter
 
+TABLE_IMAGE_CHECK_PROMPT = """如果圖片內是一個完整的表格，回答 'True'，否則回答 'False'。"""
+# 解析過的頁面快取在此資料夾，重複上傳同一份 PDF 時不需重新解析
+PARSE_CACHE_DIR = "./.parse_cache"
 
 
 class Pdf:
@@ -22,87 +27,211 @@ class Pdf:
             self.llm = llm_mapping[llm_name](api_key)
         else:
             raise NameError(f"Unsupported LLM name: {llm_name}. Available options are: {', '.join(llm_mapping.keys())}")
+        # 最近一次 extraction 的判定數量：(依信心分數直接判定, 交給 LLM 檢查)
+        self.decision_counts = (0, 0)
     
-    def _capture_table_images(self, pdf_path, output_dir="temp_images"):
+    def _capture_table_images(self, pdf_path, output_dir="temp_images", pdf_name=None):
         """
-        根據 table_infos 內的每個項目，將對應 PDF 頁面的表格區域截圖後儲存成 png。
+        找出 PDF 內的表格位置，將對應頁面的表格區域截圖後儲存成 png。
+        表格偵測與截圖共用同一個 fitz.Document (Converter.render_tables)，PDF 只開啟一次。
         
         Args:
-            pdf_path (str)      : PDF 檔案路徑
-            table_infos (list)  : [{'id': page_id, 'position': Rect(...)}, ...]
-            output_dir (str)    : 輸出圖片的資料夾
+            pdf_path (str | bytes) : PDF 檔案路徑，或記憶體中的 PDF 內容
+            output_dir (str)       : 輸出圖片的資料夾
+            pdf_name (str)         : 輸出檔名使用的 PDF 名稱，預設為檔案名稱
+
+        Returns:
+            list: [{'path': 圖片路徑, 'confidence': 表格結構的信心分數}, ...]
         """
-        if not os.path.exists(pdf_path):
+        if isinstance(pdf_path, (bytes, bytearray)):
+            cv = Converter(stream=bytes(pdf_path))
+            pdf_name = pdf_name or "document"
+        elif os.path.exists(pdf_path):
+            cv = Converter(pdf_path)
+            pdf_name = pdf_name or os.path.basename(pdf_path)
+        else:
             print(f"PDF file not found: {pdf_path}")
             return
         
-        # 開啟 PDF
-        pdf_doc = fitz.open(pdf_path)
-        
         # 輸出資料夾若不存在就自動建立
         os.makedirs(output_dir, exist_ok=True)
-        cv = Converter(pdf_path)
-        tables = cv.extract_tables()
-        for idx, info in enumerate(tables):
-            page_id = info['id']           # 頁碼 (注意 0-based or 1-based)
-            rect    = info['position']     # Rect(x0, y0, x1, y1)
-
-            # 如果 page_id 與 pdf_doc 的頁碼對不上，要調整 (e.g., page_id - 1)
-            # 先假設你回傳的 id = fitz 裡的 page index (0-based)
-            if page_id < 0 or page_id >= len(pdf_doc):
-                print(f"Warning: Invalid page_id {page_id} for table index {idx}")
-                continue
-
-            # 取得對應的 page
-            page = pdf_doc[page_id]
-
-            # 用 get_pixmap 擷取該區域 (clip=rect)
-            # 可加 matrix=fitz.Matrix(2, 2) 提升解析度
-            pix = page.get_pixmap(clip=rect)
+        captured = []
+        # 表格偵測與截圖共用 Converter 已開啟的 Document
+        # 可加 zoom=2 提升解析度
+        tables = cv.render_tables(multi_processing=True, parse_cache_dir=PARSE_CACHE_DIR)
+        for idx, (info, pix) in enumerate(tables):
+            page_id = info['id']           # 頁碼 (0-based，與 fitz 的 page index 相同)
 
             # 組出輸出檔名
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_name = f"{os.path.splitext(os.path.basename(pdf_path))[0]}_page_{page_id}_table_{idx}_{timestamp}.png"
+            output_name = f"{os.path.splitext(pdf_name)[0]}_page_{page_id}_table_{idx}_{timestamp}.png"
             output_path = os.path.join(output_dir, output_name)
 
             # 存檔
             pix.save(output_path)
             print(f"Saved table screenshot: {output_path}")
+            captured.append({'path': output_path, 'confidence': info.get('confidence')})
         
-        pdf_doc.close()
-    def extraction(self, pdf_path, table_image_dir = "table_images", temp_image_dir = "temp_images", capture_images = None, table_image_check_prompt = ""):
+        cv.close()
+        return captured
+
+    def _check_table_image(self, image_path, prompt):
+        """
+        詢問 LLM 該圖片是否為完整表格；單一請求失敗時回傳 None，不影響其他圖片。
+        """
+        try:
+            return self.llm.generate(prompt=prompt, image_path=image_path)
+        except Exception as e:
+            print(f"Error checking {image_path}: {e}")
+            return None
+
+    def _check_table_batch(self, image_paths, prompt):
+        """
+        將多張圖片放進同一個請求，要求 LLM 依序回應每張圖片的判斷結果；
+        若回應無法解析，改為逐張送出。
+        """
+        if len(image_paths) == 1:
+            return [self._check_table_image(image_paths[0], prompt)]
+        batch_prompt = f"""以下依序附上 {len(image_paths)} 張圖片，請逐一依照下列標準判斷每張圖片。
+        判斷標準：{prompt}
+        只回應一個 JSON 陣列，依圖片順序列出每張圖片的結果 true 或 false，例如 [true, false]，不要回應其他文字。
+        """
+        try:
+            res = self.llm.generate(prompt=batch_prompt, image_path=image_paths)
+        except Exception as e:
+            print(f"Error checking batch {image_paths}: {e}")
+            res = None
+        verdicts = self._parse_batch_verdicts(res, len(image_paths))
+        if verdicts is None:
+            print(f"Failed to parse batch response, checking images one by one: {res}")
+            return [self._check_table_image(path, prompt) for path in image_paths]
+        return ['True' if verdict else 'False' for verdict in verdicts]
+
+    @staticmethod
+    def _parse_batch_verdicts(res, count):
+        """
+        從回應中取出 JSON 陣列，長度須與圖片數相同，且每個元素都是 true/false；否則回傳 None。
+        """
+        if not res:
+            return None
+        match = re.search(r"\[.*?\]", res, re.S)
+        if not match:
+            return None
+        try:
+            verdicts = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(verdicts, list) or len(verdicts) != count:
+            return None
+        results = []
+        for verdict in verdicts:
+            if isinstance(verdict, str) and verdict.strip().lower() in ("true", "false"):
+                verdict = verdict.strip().lower() == "true"
+            if not isinstance(verdict, bool):
+                return None
+            results.append(verdict)
+        return results
+
+    def _check_table_images(self, image_paths, prompt, max_workers=1, batch_size=1):
+        """
+        每 batch_size 張圖片合併成一個請求，並以最多 max_workers 個同時進行的請求檢查所有圖片，
+        回傳結果的順序與 image_paths 相同。
+        """
+        batch_size = max(1, batch_size)
+        batches = [image_paths[i:i + batch_size] for i in range(0, len(image_paths), batch_size)]
+        if max_workers <= 1 or len(batches) <= 1:
+            results = [self._check_table_batch(batch, prompt) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(lambda batch: self._check_table_batch(batch, prompt), batches))
+        return [res for batch_results in results for res in batch_results]
+
+    @staticmethod
+    def _captured_confidences(captured):
+        """
+        將 capture_images 的回傳值整理成 {圖片路徑: 信心分數}；自定義的 capture_images 沒有回傳時為空。
+        """
+        confidences = {}
+        for info in captured or []:
+            if isinstance(info, dict) and 'path' in info:
+                confidences[os.path.normpath(info['path'])] = info.get('confidence')
+        return confidences
+
+    @staticmethod
+    def _decide_locally(source_paths, confidences, confidence_thresholds):
+        """
+        結構明確的圖片直接判定，不送 LLM：分數 >= high 為 'True'，<= low 為 'False'。
+        """
+        decisions = {}
+        if not confidence_thresholds:
+            return decisions
+        low, high = confidence_thresholds
+        for source_path in source_paths:
+            confidence = confidences.get(os.path.normpath(source_path))
+            if confidence is None:
+                continue
+            if confidence >= high:
+                decisions[source_path] = 'True'
+            elif confidence <= low:
+                decisions[source_path] = 'False'
+        return decisions
+
+    @staticmethod
+    def _collect_table_images(source_paths, decisions, table_image_dir):
+        """
+        判定為表格的圖片移到 table_image_dir，其餘刪除；回傳表格圖片路徑。
+        """
+        table_paths = []
+        for source_path in source_paths:
+            res = decisions.get(source_path)
+            if res and 'True' in res:
+                # 目標檔案的完整路徑
+                target_path = os.path.join(table_image_dir, os.path.basename(source_path))
+
+                # 移動檔案
+                shutil.move(source_path, target_path)
+                table_paths.append(target_path)
+                print(f"已移動: {source_path} -> {target_path}")
+            else:
+                try:
+                    os.remove(source_path)
+                    print(f"Deleted: {source_path}")
+                except Exception as e:
+                    print(f"Error deleting {source_path}: {e}")
+        return table_paths
+
+    def extraction(self, pdf_path, table_image_dir = "table_images", temp_image_dir = "temp_images", capture_images = None, table_image_check_prompt = "", max_workers = 1, batch_size = 1, confidence_thresholds = (0.2, 0.85), pdf_name = None):
+        """
+        pdf_path (str | bytes): PDF 檔案路徑，或記憶體中的 PDF 內容（例如上傳的檔案），此時以 pdf_name 命名輸出圖片。
+        confidence_thresholds (tuple): (low, high)。capture_images 回傳信心分數時，
+            分數 >= high 直接視為表格、<= low 直接捨棄，只有介於兩者之間的圖片才交給 LLM 檢查；
+            設為 None 則全部交給 LLM。
+        """
         os.makedirs(table_image_dir, exist_ok=True)
         os.makedirs(temp_image_dir, exist_ok=True)
         if capture_images == None:
-            capture_images = self._capture_table_images
+            capture_images = lambda pdf_path, output_dir: self._capture_table_images(pdf_path, output_dir, pdf_name=pdf_name)
         if table_image_check_prompt == "":
-            table_image_check_prompt = """如果圖片內是一個完整的表格，回答 'True'，否則回答 'False'。"""
+            table_image_check_prompt = TABLE_IMAGE_CHECK_PROMPT
 
-        capture_images(pdf_path, output_dir=temp_image_dir)
-        table_paths = []
+        captured = capture_images(pdf_path, output_dir=temp_image_dir)
+        confidences = self._captured_confidences(captured)
+
+        source_paths = []
         for root, dirs, files in os.walk(temp_image_dir):
             for file in files:
                 if file.lower().endswith('.png'):
                     # 檔案完整路徑
-                    source_path = os.path.join(root, file)
-                    prompt = table_image_check_prompt
-                    res = self.llm.generate(prompt=prompt, image_path = source_path)
-                    if 'True' in res:
-                        # 目標檔案的完整路徑
-                        target_path = os.path.join(table_image_dir, file)
-
-                        # 移動檔案
-                        shutil.move(source_path, target_path)
-                        table_paths.append(target_path)
-                        print(f"已移動: {source_path} -> {target_path}")
-                    else:
-                        try:
-                            os.remove(source_path)
-                            print(f"Deleted: {source_path}")
-                        except Exception as e:
-                            print(f"Error deleting {source_path}: {e}")
-        return table_paths
+                    source_paths.append(os.path.join(root, file))
+
+        decisions = self._decide_locally(source_paths, confidences, confidence_thresholds)
+        pending_paths = [path for path in source_paths if path not in decisions]
+        self.decision_counts = (len(decisions), len(pending_paths))
+        print(f"{len(decisions)} images decided locally, {len(pending_paths)} images sent to LLM.")
+        results = self._check_table_images(pending_paths, table_image_check_prompt, max_workers, batch_size)
+        decisions.update(zip(pending_paths, results))
 
+        return self._collect_table_images(source_paths, decisions, table_image_dir)
 
 if __name__ == "__main__":
     load_dotenv()
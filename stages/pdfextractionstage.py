@@ -1,5 +1,7 @@
 # pdf_extraction_stage.py
 import os
+import shutil
+import tempfile
 import streamlit as st
 from .pdf import Pdf
 from default.code import pdf_extraction_code
@@ -100,6 +102,37 @@ class PDFExtractionStage:
             height=300,
             key="pdf_prompt_input"
         )
+        pdf_max_workers = st.number_input(
+            "同時送出的表格檢查請求數上限 (第一階段):",
+            min_value=1,
+            max_value=16,
+            value=4,
+            step=1,
+            key="pdf_max_workers"
+        )
+        pdf_batch_size = st.number_input(
+            "每個表格檢查請求包含的圖片數 (第一階段，1 表示逐張檢查):",
+            min_value=1,
+            max_value=20,
+            value=10,
+            step=1,
+            key="pdf_batch_size"
+        )
+        pdf_use_confidence = st.checkbox(
+            "依表格結構的信心分數直接判定明確的圖片，不送 LLM 檢查 (第一階段)",
+            value=True,
+            help="取消勾選時所有圖片都會以上方的 prompt 交給 LLM 檢查；勾選時只有分數介於下方區間的圖片會送出。",
+            key="pdf_use_confidence"
+        )
+        pdf_confidence_thresholds = st.slider(
+            "信心分數區間 (第一階段，<= 下限直接捨棄，>= 上限直接視為表格):",
+            min_value=0.0,
+            max_value=1.0,
+            value=(0.2, 0.85),
+            step=0.05,
+            disabled=not pdf_use_confidence,
+            key="pdf_confidence_thresholds"
+        )
         run_button = st.button("Run (PDF 圖片擷取)", key="pdf_run_button")
         if run_button:
             if not pdf_api_key:
@@ -109,9 +142,11 @@ class PDFExtractionStage:
                 for uploaded_file in uploaded_files:
                     pdf_name = uploaded_file.name
                     try:
-                        temp_file_path = f"./input/{pdf_name}"
-                        with open(temp_file_path, "wb") as f:
-                            f.write(uploaded_file.getbuffer())
+                        # 直接使用記憶體中的 PDF 內容，不寫入 ./input；
+                        # 暫存截圖放在本次執行專用的資料夾，避免不同使用者上傳同名檔案時互相干擾
+                        pdf_bytes = uploaded_file.getvalue()
+                        os.makedirs("temp_images", exist_ok=True)
+                        temp_image_dir = tempfile.mkdtemp(dir="temp_images")
                         st.write(f"Initializing PDF processing for {pdf_name} with model: {pdf_model_choice}...")
                         
                         pdf = Pdf(llm_name=pdf_model_choice.lower(), api_key=pdf_api_key)
@@ -127,10 +162,17 @@ class PDFExtractionStage:
                         
                         try:
                             image_paths = pdf.extraction(
-                                pdf_path=temp_file_path,
+                                pdf_path=pdf_bytes,
+                                pdf_name=pdf_name,
+                                temp_image_dir=temp_image_dir,
                                 capture_images=capture_images,
-                                table_image_check_prompt=user_defined_image_detection_prompt
+                                table_image_check_prompt=user_defined_image_detection_prompt,
+                                max_workers=int(pdf_max_workers),
+                                batch_size=int(pdf_batch_size),
+                                confidence_thresholds=tuple(pdf_confidence_thresholds) if pdf_use_confidence else None
                             )
+                            local_count, llm_count = pdf.decision_counts
+                            st.write(f"{pdf_name}: {local_count} 張圖片依信心分數直接判定，{llm_count} 張圖片交給 LLM 檢查。")
                             if image_paths:
                                 st.write(f"Images extracted from {pdf_name}:")
                             else:
@@ -139,10 +181,7 @@ class PDFExtractionStage:
                         except Exception as e:
                             st.error(f"Error during PDF extraction for {pdf_name}: {e}")
                             st.session_state.setdefault("failed_files", []).append(pdf_name)
-                        try:
-                            os.remove(temp_file_path)
-                        except OSError:
-                            pass
+                        shutil.rmtree(temp_image_dir, ignore_errors=True)
                     except Exception as e:
                         st.error(f"Error processing file {pdf_name}: {e}")
                         st.session_state.setdefault("failed_files", []).append(pdf_name)
@@ -0,0 +1,140 @@
+"""
+CLAUDEBatch 對本機假 Message Batches 伺服器的測試：請求依上限拆成多個 batch，結果對應回 key。
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm.claude_batch import CLAUDEBatch
+
+
+class FakeBatchServer:
+    """
+    只實作 create / retrieve / results 三個端點；每個 batch 第一次查詢時仍在處理中，第二次起完成。
+    prompt 為 "fail" 的請求回傳 errored，其他請求回傳 "echo: <prompt>"。
+    """
+    def __init__(self):
+        self.batches = {}   # batch id -> 送出的請求
+        self.polls = {}     # batch id -> 查詢次數
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, content_type="application/json"):
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                requests = json.loads(self.rfile.read(length))["requests"]
+                batch_id = f"msgbatch_{len(server.batches)}"
+                server.batches[batch_id] = requests
+                server.polls[batch_id] = 0
+                self._send(json.dumps(server.batch(batch_id)))
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                batch_id = parts[3]
+                if parts[-1] == "results":
+                    self._send(server.results(batch_id), "application/binary")
+                else:
+                    server.polls[batch_id] += 1
+                    self._send(json.dumps(server.batch(batch_id)))
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def batch(self, batch_id):
+        ended = self.polls[batch_id] >= 2
+        count = len(self.batches[batch_id])
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2024-01-01T00:00:00Z",
+            "expires_at": "2024-01-02T00:00:00Z",
+            "ended_at": "2024-01-01T01:00:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def results(self, batch_id):
+        lines = []
+        for request in self.batches[batch_id]:
+            prompt = request["params"]["messages"][0]["content"][-1]["text"]
+            if prompt == "fail":
+                result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": "fake"}}}
+            else:
+                result = {"type": "succeeded", "message": {
+                    "id": "msg_0", "type": "message", "role": "assistant", "model": request["params"]["model"],
+                    "content": [{"type": "text", "text": f"echo: {prompt}"}],
+                    "stop_reason": "end_turn", "stop_sequence": None,
+                    "usage": {"input_tokens": 1, "output_tokens": 1},
+                }}
+            lines.append(json.dumps({"custom_id": request["custom_id"], "result": result}))
+        return "\n".join(lines)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    with FakeBatchServer() as server:
+        yield server
+
+
+def test_requests_split_by_count(server):
+    batch = CLAUDEBatch("fake-key", cache=False, base_url=server.url, poll_interval=0, max_batch_requests=2)
+    for i in range(5):
+        batch.add_request(f"key-{i}", prompt=f"prompt {i}")
+    batch.add_request("key-fail", prompt="fail")
+
+    results = batch.run()
+
+    assert [len(requests) for requests in server.batches.values()] == [2, 2, 2]
+    assert all(polls >= 2 for polls in server.polls.values())  # 輪詢到所有 batch 都完成
+    assert results == {f"key-{i}": f"echo: prompt {i}" for i in range(5)}
+
+
+def test_requests_split_by_size(server, tmp_path):
+    image_path = tmp_path / "table.png"
+    image_path.write_bytes(b"\0" * 3000)
+
+    batch = CLAUDEBatch("fake-key", cache=False, base_url=server.url, poll_interval=0, max_batch_bytes=5000)
+    for i in range(3):
+        batch.add_request(f"key-{i}", prompt=f"prompt {i}", image_path=str(image_path))
+
+    results = batch.run()
+
+    # 每個請求約 4 KB（base64 編碼的圖片），上限 5000 bytes 時一個 batch 只能放一個請求
+    assert [len(requests) for requests in server.batches.values()] == [1, 1, 1]
+    assert results == {f"key-{i}": f"echo: prompt {i}" for i in range(3)}
+
+
+def test_no_requests(server):
+    batch = CLAUDEBatch("fake-key", cache=False, base_url=server.url, poll_interval=0)
+    assert batch.run() == {}
+    assert not server.batches
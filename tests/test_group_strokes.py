@@ -0,0 +1,178 @@
+'''Grouping table strokes into rows/columns: a coordinate joins current row/column only if close to
+its running average, no matter the order of strokes; the coordinate of each row/column is averaged
+in stroke order like the original scan.'''
+
+import os
+import random
+import itertools
+import pytest
+from pdf2docx_custom import Converter
+from pdf2docx_custom.common.Element import Element
+from pdf2docx_custom.shape.Shape import Stroke
+from pdf2docx_custom.shape.Shapes import Shapes
+from pdf2docx_custom.table.TableStructure import TableStructure
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+MIN_BORDER_CLEARANCE = 2.0
+MAX_BORDER_WIDTH = 6.0
+
+
+def group_h_v_strokes_by_scan(strokes:Shapes, min_border_clearance:float, max_border_width:float):
+    '''The original implementation: each stroke joins the first group close enough.'''
+    def group_strokes(stroke, strokes:dict):
+        t = round(stroke.y0, 1) if stroke.horizontal else round(stroke.x0, 1)
+        for t_ in strokes:
+            if abs(t-t_)>min_border_clearance: continue
+            t = (t_+t)/2.0 # average
+            strokes[t] = strokes.pop(t_)
+            strokes[t].append(stroke)
+            break
+        else:
+            strokes[t] = Shapes([stroke])
+
+    h_strokes, v_strokes = {}, {}
+    X0, Y0, X1, Y1 = float('inf'), float('inf'), -float('inf'), -float('inf')
+    for stroke in strokes:
+        group_strokes(stroke, h_strokes if stroke.horizontal else v_strokes)
+        X0 = min(X0, stroke.x0)
+        X1 = max(X1, stroke.x1)
+        Y0 = min(Y0, stroke.y0)
+        Y1 = max(Y1, stroke.y1)
+
+    if not h_strokes or not v_strokes: return None, None
+
+    table_bbox = Element().update_bbox((X0, Y0, X1, Y1))
+    TableStructure._check_outer_strokes(table_bbox, h_strokes, 'top', max_border_width)
+    TableStructure._check_outer_strokes(table_bbox, h_strokes, 'bottom', max_border_width)
+    TableStructure._check_outer_strokes(table_bbox, v_strokes, 'left', max_border_width)
+    TableStructure._check_outer_strokes(table_bbox, v_strokes, 'right', max_border_width)
+
+    for _, borders in h_strokes.items(): borders.sort_in_line_order()
+    for _, borders in v_strokes.items(): borders.sort_in_reading_order()
+    return h_strokes, v_strokes
+
+
+def group_h_v_strokes(strokes:list):
+    return TableStructure._group_h_v_strokes(Shapes(strokes), MIN_BORDER_CLEARANCE, MAX_BORDER_WIDTH)
+
+
+def h_stroke(y, x0=0.0, x1=100.0): return Stroke({'start': (x0, y), 'end': (x1, y), 'width': 1.0})
+
+def v_stroke(x, y0=0.0, y1=100.0): return Stroke({'start': (x, y0), 'end': (x, y1), 'width': 1.0})
+
+
+def _groups(strokes:dict):
+    '''Sorted keys and bbox of strokes in each group.'''
+    return [(k, sorted(tuple(stroke.bbox) for stroke in strokes[k])) for k in sorted(strokes)]
+
+
+def _coordinate(stroke):
+    return round(stroke.y0, 1) if stroke.horizontal else round(stroke.x0, 1)
+
+
+def random_strokes(seed:int):
+    '''Grid of jittered border segments, with chains of coordinates drifting beyond the clearance.'''
+    rng = random.Random(seed)
+    rows = sorted(rng.sample(range(0, 400, 5), rng.randint(2, 12)))
+    cols = sorted(rng.sample(range(0, 400, 5), rng.randint(2, 12)))
+    X0, X1, Y0, Y1 = cols[0], cols[-1], rows[0], rows[-1]
+    strokes = []
+    for y in rows:
+        t = y
+        for _ in range(rng.randint(1, 5)):
+            t += rng.choice([0, 0.1, 0.5, 1.5, -0.3]) # drifting
+            x0 = rng.uniform(X0, X1-1)
+            strokes.append(h_stroke(t, x0, rng.uniform(x0+1, X1)))
+    for x in cols:
+        t = x
+        for _ in range(rng.randint(1, 5)):
+            t += rng.choice([0, 0.1, 0.5, 1.5, -0.3])
+            y0 = rng.uniform(Y0, Y1-1)
+            strokes.append(v_stroke(t, y0, rng.uniform(y0+1, Y1)))
+    rng.shuffle(strokes)
+    return strokes
+
+
+def test_compare_with_running_average():
+    '''Adjacent gaps are all within the clearance, but 103 is away from the average of 100 and 101.5.'''
+    ys = [100, 101.5, 103, 104.5]
+    for order in itertools.permutations(ys):
+        h_strokes, _ = group_h_v_strokes([h_stroke(y) for y in order] + [v_stroke(0), v_stroke(100)])
+        keys = [k for k in sorted(h_strokes) if h_strokes[k][0].width] # ignore dummy outer strokes
+        assert keys == [100.75, 103.75]
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_same_as_scan_for_sorted_strokes(seed):
+    '''The original scan is consistent when strokes come in coordinate order.'''
+    strokes = sorted(random_strokes(seed), key=_coordinate)
+    expected_h, expected_v = group_h_v_strokes_by_scan(Shapes(strokes), MIN_BORDER_CLEARANCE, MAX_BORDER_WIDTH)
+    h_strokes, v_strokes = group_h_v_strokes(strokes)
+    assert _groups(h_strokes) == _groups(expected_h)
+    assert _groups(v_strokes) == _groups(expected_v)
+
+
+def grid_strokes(seed:int):
+    '''Shuffled grid of border segments, where strokes of each row/column lie within the clearance.'''
+    rng = random.Random(seed)
+    rows = sorted(rng.sample(range(0, 400, 10), rng.randint(2, 12)))
+    cols = sorted(rng.sample(range(0, 400, 10), rng.randint(2, 12)))
+    X0, X1, Y0, Y1 = cols[0], cols[-1], rows[0], rows[-1]
+    spread = MIN_BORDER_CLEARANCE / 2.0
+    strokes = []
+    for y in rows:
+        for _ in range(rng.randint(1, 6)):
+            x0 = rng.uniform(X0, X1-1)
+            strokes.append(h_stroke(y+rng.uniform(0, spread), x0, rng.uniform(x0+1, X1)))
+    for x in cols:
+        for _ in range(rng.randint(1, 6)):
+            y0 = rng.uniform(Y0, Y1-1)
+            strokes.append(v_stroke(x+rng.uniform(0, spread), y0, rng.uniform(y0+1, Y1)))
+    rng.shuffle(strokes)
+    return strokes
+
+
+def test_average_in_stroke_order():
+    h_strokes, _ = group_h_v_strokes([h_stroke(y) for y in (100.0, 100.4, 100.2)] + [v_stroke(0), v_stroke(100)])
+    keys = [k for k in sorted(h_strokes) if h_strokes[k][0].width]
+    assert keys == [((100.0+100.4)/2.0+100.2)/2.0] # 100.2 rather than 100.25 averaged in sorted order
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_same_as_scan_for_shuffled_strokes(seed):
+    '''The original scan in drawing order, when each row/column lies within the clearance.'''
+    strokes = grid_strokes(seed)
+    expected_h, expected_v = group_h_v_strokes_by_scan(Shapes(strokes), MIN_BORDER_CLEARANCE, MAX_BORDER_WIDTH)
+    h_strokes, v_strokes = group_h_v_strokes(strokes)
+    assert _groups(h_strokes) == _groups(expected_h)
+    assert _groups(v_strokes) == _groups(expected_v)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_groups_independent_of_stroke_order(seed):
+    '''Strokes in each row/column do not depend on stroke order, though the averaged coordinate may 
+    slightly.'''
+    strokes = random_strokes(seed)
+    expected_h, expected_v = group_h_v_strokes(sorted(strokes, key=_coordinate))
+    h_strokes, v_strokes = group_h_v_strokes(strokes)
+    members = lambda groups: [bboxes for _, bboxes in _groups(groups)]
+    assert members(h_strokes) == members(expected_h)
+    assert members(v_strokes) == members(expected_v)
+
+
+@pytest.mark.skipif(not os.path.exists(PDF), reason='sample pdf not found')
+def test_same_as_scan_for_real_strokes(monkeypatch):
+    '''Strokes of lattice tables in drawing order.'''
+    group_h_v_strokes = TableStructure._group_h_v_strokes
+    results = []
+    def compare(strokes, min_border_clearance, max_border_width):
+        expected = group_h_v_strokes_by_scan(strokes, min_border_clearance, max_border_width)
+        res = group_h_v_strokes(strokes, min_border_clearance, max_border_width)
+        results.append([_groups(x) if x else x for x in res]==[_groups(x) if x else x for x in expected])
+        return res
+
+    monkeypatch.setattr(TableStructure, '_group_h_v_strokes', staticmethod(compare))
+    cv = Converter(PDF)
+    cv.parse(**cv.default_settings)
+    cv.close()
+    assert results and all(results)
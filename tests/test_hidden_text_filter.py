@@ -0,0 +1,153 @@
+'''Hidden text filtering with indexed spans must keep the same blocks as the original nested loop
+comparing every span with every filtered span.'''
+
+import os
+import random
+import types
+import fitz
+import pytest
+from pdf2docx_custom.page.RawPageFitz import RawPageFitz
+from pdf2docx_custom.common.algorithm import get_area
+from pdf2docx_custom.common.constants import FACTOR_A_HALF
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+
+
+def filter_blocks_by_loop(text_blocks:list, spans:list, ocr:int):
+    '''The original implementation: compare each span with all filtered spans.'''
+    if not spans: return text_blocks
+    if ocr==2:
+        f = lambda span: span['type']!=3
+    else:
+        f = lambda span: span['type']==3
+    filtered_spans = list(filter(f, spans))
+
+    def span_area(bbox):
+        x0, y0, x1, y1 = bbox
+        return (x1-x0) * (y1-y0)
+
+    blocks = []
+    for block in text_blocks:
+        intersected = False
+        for line in block['lines']:
+            for span in line['spans']:
+                for filter_span in filtered_spans:
+                    intersected_area = get_area(span['bbox'], filter_span['bbox'])
+                    if intersected_area / span_area(span['bbox']) >= FACTOR_A_HALF \
+                        and span['font']==filter_span['font']:
+                        intersected = True
+                        break
+                if intersected: break
+            if intersected: break
+        if not intersected: blocks.append(block)
+    return blocks
+
+
+def filter_blocks_by_index(text_blocks:list, spans:list, ocr:int):
+    '''Current implementation with a page engine providing ``spans`` as texttrace.'''
+    engine = types.SimpleNamespace(get_texttrace=lambda: spans)
+    return RawPageFitz(page_engine=engine)._filter_hidden_text(text_blocks, ocr)
+
+
+# -------------------------------------------------
+# randomized spans
+# -------------------------------------------------
+FONTS = ['SimSun', 'Arial', 'TimesNewRoman']
+
+def random_bbox(rng:random.Random):
+    x0, y0 = rng.uniform(0, 500), rng.uniform(0, 700)
+    # integer-like coordinates to create exactly touching and covering spans
+    if rng.random()<0.3: x0, y0 = round(x0, -1), round(y0, -1)
+    return (x0, y0, x0+rng.choice([5, 10, 20, rng.uniform(1, 60)]), y0+rng.choice([10, rng.uniform(1, 30)]))
+
+
+def random_case(seed:int):
+    rng = random.Random(seed)
+    spans = [{'bbox': random_bbox(rng), 'font': rng.choice(FONTS), 'type': rng.choice([0, 3, 3])}
+             for _ in range(rng.randint(1, 80))]
+
+    # text blocks: either copied from texttrace spans, shifted a little, or random
+    text_blocks = []
+    for _ in range(rng.randint(1, 20)):
+        lines = []
+        for _ in range(rng.randint(1, 3)):
+            line_spans = []
+            for _ in range(rng.randint(1, 4)):
+                ref = rng.choice(spans)
+                x0, y0, x1, y1 = ref['bbox']
+                d = rng.choice([0, 0, 1, 3, 10])
+                bbox = (x0+d, y0, x1+d, y1) if rng.random()<0.7 else random_bbox(rng)
+                font = ref['font'] if rng.random()<0.8 else rng.choice(FONTS)
+                line_spans.append({'bbox': bbox, 'font': font})
+            lines.append({'spans': line_spans})
+        text_blocks.append({'lines': lines})
+    return text_blocks, spans
+
+
+@pytest.mark.parametrize('ocr', [0, 2])
+@pytest.mark.parametrize('seed', range(300))
+def test_randomized_spans(seed, ocr):
+    text_blocks, spans = random_case(seed)
+    assert filter_blocks_by_index(text_blocks, spans, ocr) == \
+        filter_blocks_by_loop(text_blocks, spans, ocr)
+
+
+# -------------------------------------------------
+# real spans
+# -------------------------------------------------
+def _hidden_text_pdf():
+    '''Pdf with overlapped visible and hidden text in same and different fonts.'''
+    doc = fitz.Document()
+    page = doc.new_page()
+    for i in range(20):
+        y = 72 + i*18
+        page.insert_text((72, y), f'visible line {i}', fontname='helv', fontsize=11)
+        if i%3==0: # hidden text over visible text with same font
+            page.insert_text((72, y), f'hidden line {i}', fontname='helv', fontsize=11, render_mode=3)
+        elif i%3==1: # hidden text with another font
+            page.insert_text((72, y), f'hidden line {i}', fontname='cour', fontsize=11, render_mode=3)
+        page.insert_text((300, y), f'hidden only {i}', fontname='tiro', fontsize=10, render_mode=3)
+    for i in range(5): # visible text only
+        page.insert_text((72, 600+i*18), f'visible only {i}', fontname='helv', fontsize=11)
+    return fitz.Document(stream=doc.tobytes())
+
+
+def _real_pages():
+    yield from _hidden_text_pdf()
+    if os.path.exists(PDF): yield from fitz.Document(PDF)
+
+
+@pytest.mark.parametrize('ocr', [0, 2])
+def test_real_spans(ocr):
+    for page in _real_pages():
+        text_blocks = page.get_text('rawdict', flags=64)['blocks']
+        spans = page.get_texttrace()
+        expected = filter_blocks_by_loop(text_blocks, spans, ocr)
+        assert filter_blocks_by_index(text_blocks, spans, ocr) == expected
+
+
+def test_hidden_text_removed():
+    page = _hidden_text_pdf()[0]
+    text_blocks = page.get_text('rawdict', flags=64)['blocks']
+    blocks = filter_blocks_by_index(text_blocks, page.get_texttrace(), 0)
+    assert 0 < len(blocks) < len(text_blocks)
+
+
+# -------------------------------------------------
+# zero-area span
+# -------------------------------------------------
+def test_zero_area_span():
+    '''The original loop raised ZeroDivisionError for a span with zero area, which is now taken
+    as not matched, i.e. the block is kept.'''
+    spans = [{'bbox': (10, 10, 50, 20), 'font': 'Arial', 'type': 3}]
+    for bbox in [(20, 15, 20, 18), (20, 15, 30, 15), (20, 15, 20, 15)]:
+        text_blocks = [{'lines': [{'spans': [{'bbox': bbox, 'font': 'Arial'}]}]}]
+        with pytest.raises(ZeroDivisionError):
+            filter_blocks_by_loop(text_blocks, spans, 0)
+        assert filter_blocks_by_index(text_blocks, spans, 0) == text_blocks
+
+    # zero-area span in a block with another hidden span: still filtered by the other one
+    text_blocks = [{'lines': [{'spans': [
+        {'bbox': (20, 15, 20, 18), 'font': 'Arial'},
+        {'bbox': (12, 12, 30, 18), 'font': 'Arial'}]}]}]
+    assert filter_blocks_by_index(text_blocks, spans, 0) == []
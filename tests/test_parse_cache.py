@@ -0,0 +1,58 @@
+'''Pages restored from the parse cache must be the same as parsed, and a cached page failed to
+restore is parsed again.'''
+
+import os
+import json
+import zipfile
+from pdf2docx_custom import Converter
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+PAGES = [2] # page with CJK font names, e.g. 標楷體
+
+
+def _convert(cache_dir, docx_filename):
+    '''Convert pages and return the parsed layout and docx contents.'''
+    cv = Converter(PDF)
+    cv.convert(docx_filename, pages=PAGES, parse_cache_dir=cache_dir)
+    data = json.loads(json.dumps(cv.store()))
+    cv.close()
+    with zipfile.ZipFile(docx_filename) as f:
+        document = f.read('word/document.xml')
+    return data, document
+
+
+def _fonts(data):
+    def collect(x):
+        if isinstance(x, dict):
+            if 'font' in x: yield x['font']
+            for v in x.values(): yield from collect(v)
+        elif isinstance(x, list):
+            for v in x: yield from collect(v)
+    return set(collect(data))
+
+
+def test_restore_from_cache(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    parsed, parsed_document = _convert(cache_dir, str(tmp_path / 'parsed.docx'))
+    restored, restored_document = _convert(cache_dir, str(tmp_path / 'restored.docx'))
+
+    assert any(ord(c)>255 for font in _fonts(parsed) for c in font)
+    assert _fonts(restored) == _fonts(parsed)
+    assert restored_document == parsed_document
+
+
+def test_restore_error_as_cache_miss(tmp_path, caplog):
+    cache_dir = str(tmp_path / 'cache')
+    _, parsed_document = _convert(cache_dir, str(tmp_path / 'parsed.docx'))
+
+    # break the cached page: a valid binary file but invalid layout
+    cv = Converter(PDF)
+    settings = cv.default_settings
+    settings['parse_cache_dir'] = cache_dir
+    cache = cv._parse_cache(**settings)
+    cv.close()
+    cache.set(PAGES[0], {'id': PAGES[0], 'sections': [{'columns': [{'blocks': 'invalid'}]}]})
+
+    _, restored_document = _convert(cache_dir, str(tmp_path / 'restored.docx'))
+    assert 'Ignore cached page' in caplog.text
+    assert restored_document == parsed_document
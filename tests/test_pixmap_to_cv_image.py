@@ -0,0 +1,64 @@
+'''Converting pixmaps to opencv images directly must give the same images as the original png
+encoding and decoding round trip.'''
+
+import os
+import cv2 as cv
+import fitz
+import numpy as np
+import pytest
+from pdf2docx_custom.image.ImagesExtractor import ImagesExtractor
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+
+
+def pixmap_to_cv_image_by_png(pixmap:fitz.Pixmap):
+    '''The original implementation.'''
+    return cv.imdecode(np.frombuffer(pixmap.tobytes(), np.uint8), cv.IMREAD_COLOR)
+
+
+def _pixmap(colorspace, n:int, alpha:bool, w:int=37, h:int=23, seed:int=0):
+    '''Pixmap with random samples; color components are premultiplied with alpha if any.'''
+    rng = np.random.default_rng(seed)
+    samples = rng.integers(0, 256, (h, w, n+alpha), dtype=np.uint8)
+    if alpha:
+        samples[..., -1][samples[..., -1]<16] = 0 # fully transparent pixels
+        samples[..., :n] = (samples[..., :n].astype(np.uint16) * samples[..., -1:] // 255).astype(np.uint8)
+    return fitz.Pixmap(colorspace, w, h, samples.tobytes(), alpha)
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('colorspace,n', [(fitz.csRGB, 3), (fitz.csGRAY, 1)])
+def test_same_as_png(colorspace, n, seed):
+    pixmap = _pixmap(colorspace, n, False, seed=seed)
+    img = ImagesExtractor._pixmap_to_cv_image(pixmap)
+    assert img.shape==(pixmap.height, pixmap.width, 3) and img.dtype==np.uint8
+    assert np.array_equal(img, pixmap_to_cv_image_by_png(pixmap))
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('colorspace,n', [(fitz.csRGB, 3), (fitz.csGRAY, 1)])
+def test_alpha_same_as_png(colorspace, n, seed):
+    '''Rounding when dividing alpha out may differ by 1.'''
+    pixmap = _pixmap(colorspace, n, True, seed=seed)
+    img = ImagesExtractor._pixmap_to_cv_image(pixmap)
+    expected = pixmap_to_cv_image_by_png(pixmap)
+    assert img.shape==expected.shape
+    assert np.abs(img.astype(np.int16)-expected).max() <= 1
+
+
+@pytest.mark.skipif(not os.path.exists(PDF), reason='sample pdf not found')
+def test_rendered_page_same_as_png():
+    with fitz.Document(PDF) as doc:
+        pixmap = doc[3].get_pixmap(clip=(50, 50, 351, 250)) # odd width
+    assert np.array_equal(ImagesExtractor._pixmap_to_cv_image(pixmap), pixmap_to_cv_image_by_png(pixmap))
+
+
+def test_cmyk():
+    '''The png round trip raised error for CMYK pixmap, which is converted to RGB first now.'''
+    pixmap = _pixmap(fitz.csCMYK, 4, False)
+    with pytest.raises(Exception):
+        pixmap_to_cv_image_by_png(pixmap)
+
+    img = ImagesExtractor._pixmap_to_cv_image(pixmap)
+    rgb = fitz.Pixmap(fitz.csRGB, pixmap)
+    assert np.array_equal(img, pixmap_to_cv_image_by_png(rgb))
@@ -0,0 +1,100 @@
+'''Round trip of the compact binary format against ``store()``/``restore()`` in JSON.'''
+
+import os
+import json
+import base64
+import fitz
+import pytest
+from pdf2docx_custom import Converter
+from pdf2docx_custom.common import serialization
+
+
+def _create_pdf():
+    '''Pdf with text, a lattice table and raster images, i.e. image blocks in parsed layout.'''
+    doc = fitz.Document()
+    page = doc.new_page()
+    page.insert_text((72, 72), 'Binary serialization round trip', fontsize=12)
+
+    # lattice table: 3 rows x 2 columns
+    for i in range(4):
+        page.draw_line((72, 100+i*20), (372, 100+i*20))
+    for x in (72, 222, 372):
+        page.draw_line((x, 100), (x, 160))
+    for i in range(3):
+        for j in range(2):
+            page.insert_text((76+j*150, 115+i*20), f'cell {i}-{j}', fontsize=10)
+
+    # raster images: opaque and with alpha channel
+    for k, alpha in enumerate((False, True)):
+        pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 30), alpha)
+        pix.set_rect(pix.irect, (200, 50*k, 80, 128) if alpha else (30, 120, 200))
+        rect = fitz.Rect(72+k*160, 200, 192+k*160, 290)
+        page.insert_image(rect, stream=pix.tobytes('png'))
+
+    stream = doc.tobytes()
+    doc.close()
+    return stream
+
+
+def _images(data):
+    '''All image values in stored layout.'''
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if k=='image': yield v
+            else: yield from _images(v)
+    elif isinstance(data, list):
+        for v in data: yield from _images(v)
+
+
+def _encode_images(data):
+    '''Encode image bytes with base64 like ``Image.store()``, so as to compare with JSON.'''
+    if isinstance(data, dict):
+        return {k: base64.b64encode(v).decode() if k=='image' and isinstance(v, bytes) \
+                    else _encode_images(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_encode_images(v) for v in data]
+    return data
+
+
+@pytest.fixture(scope='module')
+def converter():
+    cv = Converter(stream=_create_pdf())
+    cv.parse(**cv.default_settings)
+    yield cv
+    cv.close()
+
+
+def test_stored_layout_has_images(converter):
+    assert list(_images(converter.store()))
+
+
+def test_dumps_loads(converter):
+    data = converter.store()
+    expected = json.loads(json.dumps(data))
+
+    restored = serialization.loads(serialization.dumps(data))
+
+    assert all(isinstance(image, bytes) for image in _images(restored))
+    assert _encode_images(restored) == expected
+
+
+def test_invalid_data():
+    with pytest.raises(ValueError):
+        serialization.loads(b'JSON' + serialization.dumps({})[4:])
+
+
+def test_serialize_and_restore(converter, tmp_path):
+    json_filename = os.path.join(tmp_path, 'layout.json')
+    bin_filename = os.path.join(tmp_path, 'layout.bin')
+    converter.serialize(json_filename)
+    converter.serialize_binary(bin_filename)
+    assert os.path.getsize(bin_filename) < os.path.getsize(json_filename)
+
+    from_json = Converter(stream=_create_pdf())
+    from_json.deserialize(json_filename)
+    from_bin = Converter(stream=_create_pdf())
+    from_bin.deserialize_binary(bin_filename)
+
+    assert from_bin.store() == from_json.store()
+    from_json.close()
+    from_bin.close()
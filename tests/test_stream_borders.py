@@ -0,0 +1,167 @@
+'''Stream table borders finalized by strokes indexed by valid range must be the same as the original
+loop checking each stroke with all borders.'''
+
+import os
+import random
+import zipfile
+import fitz
+import pytest
+from pdf2docx_custom import Converter
+from pdf2docx_custom.common import constants
+from pdf2docx_custom.common.share import RectType
+from pdf2docx_custom.shape.Shape import Stroke, Fill
+from pdf2docx_custom.shape.Shapes import Shapes
+from pdf2docx_custom.table.Border import Border, Borders
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+
+
+def finalize_by_strokes_loop(self, strokes:list):
+    '''The original implementation of ``Borders._finalize_by_strokes()``.'''
+    for stroke in strokes:
+        if stroke.is_determined: continue
+        for border in self._instances:
+            if stroke.horizontal != border.is_horizontal: continue
+            border.finalize_by_stroke(stroke)
+
+
+# -------------------------------------------------
+# randomized borders and strokes
+# -------------------------------------------------
+def random_case(seed:int):
+    '''Stream table borders like ``TablesConstructor._inner_borders()``, and strokes/fills on or
+    around the valid ranges, e.g. exactly on the range end points with margin.'''
+    rng = random.Random(seed)
+    X0, Y0, X1, Y1 = 50, 50, 550, 750
+    top    = Border('HT', border_range=(Y0, Y0+rng.uniform(2, 20)))
+    bottom = Border('HB', border_range=(Y1-rng.uniform(2, 20), Y1))
+    left   = Border('VL', border_range=(X0, X0+rng.uniform(2, 20)))
+    right  = Border('VR', border_range=(X1-rng.uniform(2, 20), X1))
+    top.set_boundary_borders((left, right))
+    bottom.set_boundary_borders((left, right))
+    left.set_boundary_borders((top, bottom))
+    right.set_boundary_borders((top, bottom))
+    borders = Borders([top, bottom, left, right])
+
+    # columns and rows in each column
+    xs = sorted(rng.sample(range(X0+30, X1-30, 10), rng.randint(0, 6)))
+    col_borders = [left]
+    for x in xs:
+        border = Border('VI', border_range=(x, x+rng.choice([0, 2, 5, 8])), borders=(top, bottom))
+        borders.append(border)
+        col_borders.append(border)
+    col_borders.append(right)
+
+    reference = len(col_borders)<=3
+    for l, r in zip(col_borders, col_borders[1:]):
+        for y in sorted(rng.sample(range(Y0+30, Y1-30, 10), rng.randint(0, 8))):
+            borders.append(Border('HI', border_range=(y, y+rng.choice([0, 1, 3, 6])),
+                            borders=(l, r), reference=reference))
+
+    # candidate positions: range end points with and without margin, inside and outside ranges
+    def positions(horizontal:bool):
+        res = [X0, X1]
+        for border in borders:
+            if border.is_horizontal!=horizontal: continue
+            for x in (border.LRange, border.URange):
+                res.extend([x, x-constants.MINOR_DIST, x+constants.MINOR_DIST, x+0.5])
+            res.append((border.LRange+border.URange)/2.0)
+        return res
+
+    h_positions, v_positions = positions(True), positions(False)
+    strokes = Shapes()
+    for _ in range(rng.randint(0, 40)):
+        width, color = rng.choice([0.5, 1.0, 2.0]), rng.randint(0, 0xffffff)
+        if rng.random()<0.5:
+            y = rng.choice(h_positions) if rng.random()<0.8 else rng.uniform(Y0, Y1)
+            x0 = rng.uniform(X0-10, X1)
+            start, end = (x0, y), (rng.uniform(x0, X1+10), y)
+        else:
+            x = rng.choice(v_positions) if rng.random()<0.8 else rng.uniform(X0, X1)
+            y0 = rng.uniform(Y0-10, Y1)
+            start, end = (x, y0), (x, rng.uniform(y0, Y1+10))
+        stroke = Stroke({'start': start, 'end': end, 'width': width, 'color': color})
+        if rng.random()<0.1: stroke.type = RectType.UNDERLINE # determined already
+        strokes.append(stroke)
+
+    fills = Shapes()
+    for _ in range(rng.randint(0, 5)):
+        x0, y0 = rng.choice(v_positions), rng.choice(h_positions)
+        bbox = (x0, y0, x0+rng.uniform(5, 200), y0+rng.uniform(5, 100))
+        fills.append(Fill({'bbox': bbox, 'color': rng.choice([0, 0xffffff, 0xcccccc])}))
+
+    return borders, strokes, fills
+
+
+def _finalized(borders:Borders, strokes:Shapes):
+    res = []
+    for border in borders:
+        stroke = border.to_stroke()
+        res.append((border.border_type, border.finalized, border.value, border.is_reference,
+                    border.width, border.color, tuple(stroke.bbox) if stroke else None))
+    return res, [stroke.type for stroke in strokes]
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_randomized_borders(seed, monkeypatch):
+    borders, strokes, fills = random_case(seed)
+    borders.finalize(strokes, fills)
+    result = _finalized(borders, strokes)
+
+    monkeypatch.setattr(Borders, '_finalize_by_strokes', finalize_by_strokes_loop)
+    borders, strokes, fills = random_case(seed)
+    borders.finalize(strokes, fills)
+    assert result == _finalized(borders, strokes)
+
+
+# -------------------------------------------------
+# real pages
+# -------------------------------------------------
+def _stream_table_pdf():
+    '''Borderless tables with partial explicit borders, shadings and underlined text.'''
+    doc = fitz.Document()
+    for k in range(3):
+        page = doc.new_page()
+        y0 = 80
+        for i in range(8):
+            y = y0 + i*22
+            for j, x in enumerate((72, 200, 330, 450)[:2+k]):
+                page.insert_text((x, y), f'cell {i}-{j}', fontsize=10)
+            if i%3==0: # header line or separators
+                page.draw_line((70, y+6), (540, y+6), width=0.5+0.5*k)
+            if i==5: # underline
+                page.draw_line((72, y+2), (110, y+2), width=0.5)
+        page.draw_rect(fitz.Rect(195, y0-12, 320, y0+4), color=None, fill=(0.8, 0.8, 0.8))
+        if k==2: page.draw_line((325, y0-14), (325, y0+160), width=1)
+    return doc.tobytes()
+
+
+def _convert(stream:bytes, docx_filename:str, pages=None):
+    cv = Converter(stream=stream)
+    cv.convert(docx_filename, pages=pages)
+    cv.close()
+    with zipfile.ZipFile(docx_filename) as f:
+        return f.read('word/document.xml')
+
+
+def _sources():
+    yield 'generated', _stream_table_pdf()
+    if os.path.exists(PDF):
+        with open(PDF, 'rb') as f: yield '113Q3', f.read()
+
+
+@pytest.mark.parametrize('name,stream', list(_sources()))
+def test_real_pages(name, stream, tmp_path, monkeypatch):
+    # strokes passed to stream tables
+    calls = []
+    finalize_by_strokes = Borders._finalize_by_strokes
+    def counted(self, strokes):
+        if strokes: calls.append(len(strokes))
+        return finalize_by_strokes(self, strokes)
+
+    monkeypatch.setattr(Borders, '_finalize_by_strokes', counted)
+    document = _convert(stream, str(tmp_path / f'{name}.docx'))
+    if name=='generated': assert calls
+
+    monkeypatch.setattr(Borders, '_finalize_by_strokes', finalize_by_strokes_loop)
+    assert _convert(stream, str(tmp_path / f'{name}-loop.docx')) == document
@@ -0,0 +1,55 @@
+'''Confidence score of located tables must not change once parsed pages are stored and restored,
+e.g. pages parsed in worker processes or read from the parse cache.'''
+
+import os
+import json
+import pytest
+from pdf2docx_custom import Converter
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+PAGES = [4, 6, 9]
+SETTINGS = {'locate_tables_only': True}
+
+
+def _confidences(tables):
+    return [(table['id'], tuple(table['position']), table['confidence']) for table in tables]
+
+
+@pytest.fixture(scope='module')
+def parsed():
+    '''Tables located in current process, and the stored pages.'''
+    cv = Converter(PDF)
+    tables = cv.extract_tables(pages=PAGES, **SETTINGS)
+    data = cv.store()
+    cv.close()
+    return tables, data
+
+
+def test_located_tables_are_scored(parsed):
+    tables, _ = parsed
+    assert tables
+    assert all(0.0 < table['confidence'] <= 1.0 for table in tables)
+
+
+def test_confidence_restored_from_stored_pages(parsed):
+    tables, data = parsed
+    settings = Converter(PDF).default_settings
+    settings.update(SETTINGS)
+
+    cv = Converter(PDF)
+    cv.restore(json.loads(json.dumps(data)))
+    restored_tables = []
+    for page in cv.pages:
+        if page.finalized: restored_tables.extend(page.extract_tables(**settings))
+    cv.close()
+
+    assert _confidences(restored_tables) == _confidences(tables)
+
+
+def test_confidence_restored_from_parse_cache(parsed, tmp_path):
+    tables, _ = parsed
+    for _ in range(2): # parse and cache pages, then restore them from cache
+        cv = Converter(PDF)
+        cached_tables = cv.extract_tables(pages=PAGES, parse_cache_dir=str(tmp_path), **SETTINGS)
+        cv.close()
+        assert _confidences(cached_tables) == _confidences(tables)
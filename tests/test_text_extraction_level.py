@@ -0,0 +1,87 @@
+'''Text extracted in span or line level: same tables as in char level, and chars rebuilt from
+span text on demand.'''
+
+import os
+import fitz
+import pytest
+from pdf2docx_custom import Converter
+from pdf2docx_custom.page.RawPageFitz import RawPageFitz
+from pdf2docx_custom.shape.Shape import Stroke
+from pdf2docx_custom.text.Line import Line
+from pdf2docx_custom.text.TextSpan import TextSpan
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+
+
+def _tables(level:str):
+    cv = Converter(PDF)
+    tables = cv.extract_tables(locate_tables_only=True, text_extraction_level=level)
+    cv.close()
+    return [(table['id'], tuple(table['position'])) for table in tables]
+
+
+@pytest.fixture(scope='module')
+def char_level_tables():
+    return _tables('chars')
+
+
+@pytest.mark.skipif(not os.path.exists(PDF), reason='sample pdf not found')
+@pytest.mark.parametrize('level', ['spans', 'lines'])
+def test_same_tables_as_char_level(level, char_level_tables):
+    assert char_level_tables
+    assert _tables(level) == char_level_tables
+
+
+def test_invalid_level():
+    doc = fitz.Document()
+    doc.new_page().insert_text((72, 72), 'text')
+    stream = doc.tobytes()
+
+    # raised before parsing pages, rather than ignored as page error
+    cv = Converter(stream=stream)
+    with pytest.raises(ValueError):
+        cv.extract_tables(text_extraction_level='words')
+    cv.close()
+
+    raw_page = RawPageFitz(page_engine=fitz.Document(stream=stream)[0])
+    with pytest.raises(ValueError):
+        raw_page._preprocess_text(ocr=0, text_extraction_level='words')
+
+
+def _bboxes(chars:list):
+    return [tuple(round(x, 6) for x in char.bbox) for char in chars]
+
+
+def test_rebuild_horizontal_chars():
+    span = TextSpan({'bbox': (0, 0, 40, 10), 'text': 'abcd'})
+    chars = span.rebuild_chars()
+    assert [char.c for char in chars] == list('abcd')
+    assert _bboxes(chars) == [(0, 0, 10, 10), (10, 0, 20, 10), (20, 0, 30, 10), (30, 0, 40, 10)]
+    assert span.rebuild_chars() is chars # rebuilt once only
+
+
+def test_rebuild_vertical_chars():
+    line = Line({'dir': (0.0, -1.0), 'spans': [{'bbox': (0, 0, 10, 30), 'text': 'abc'}]})
+    span = line.spans[0]
+    assert line.is_vertical_text
+    chars = span.rebuild_chars()
+    assert [char.c for char in chars] == list('abc')
+    # from bottom to top
+    assert _bboxes(chars) == [(0, 20, 10, 30), (0, 10, 10, 20), (0, 0, 10, 10)]
+
+
+def test_split_span_without_chars():
+    # underline over the 3rd-6th chars
+    span = TextSpan({'bbox': (0, 0, 80, 10), 'text': 'abcdefgh'})
+    parts = span.split(Stroke({'start': (20, 10), 'end': (60, 10), 'width': 0.5}))
+    assert [part.text for part in parts] == ['ab', 'cdef', 'gh']
+    assert [bool(part.style) for part in parts] == [False, True, False]
+
+    # underline at the head, and over the whole span
+    span = TextSpan({'bbox': (0, 0, 80, 10), 'text': 'abcdefgh'})
+    parts = span.split(Stroke({'start': (0, 10), 'end': (30, 10), 'width': 0.5}))
+    assert [part.text for part in parts] == ['abc', 'defgh']
+
+    span = TextSpan({'bbox': (0, 0, 80, 10), 'text': 'abcdefgh'})
+    parts = span.split(Stroke({'start': (-5, 10), 'end': (85, 10), 'width': 0.5}))
+    assert [part.text for part in parts] == ['abcdefgh']
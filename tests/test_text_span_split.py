@@ -0,0 +1,125 @@
+'''Splitting text spans with ``TextSpan._slice()`` must give the same parts as the original
+implementation deep copying the whole span for each part.'''
+
+import os
+import fitz
+import pytest
+from pdf2docx_custom.shape.Shape import Stroke, Fill
+from pdf2docx_custom.text.TextSpan import TextSpan
+
+PDF = os.path.join(os.path.dirname(__file__), '..', 'input', '113Q3.pdf')
+
+
+def split_by_copy(span:TextSpan, rect, horizontal:bool=True):
+    '''The original ``TextSpan.split()``: each part is a deep copy with sliced chars.'''
+    intsec = rect.bbox & span.bbox
+    if intsec.is_empty: return [span]
+
+    split_spans = []
+    if horizontal:
+        intsec.y0 = span.bbox.y0
+        intsec.y1 = span.bbox.y1
+    else:
+        intsec.x0 = span.bbox.x0
+        intsec.x1 = span.bbox.x1
+
+    f = lambda items: items[1].contained_in_rect(rect, horizontal)
+    index_chars = list(filter(f, enumerate(span.chars)))
+    pos = index_chars[0][0] if index_chars else -1
+    length = len(index_chars)
+    pos_end = max(pos+length, 0)
+
+    if pos > 0:
+        if horizontal:
+            bbox = (span.bbox.x0, span.bbox.y0, intsec.x0, span.bbox.y1)
+        else:
+            bbox = (span.bbox.x0, intsec.y1, span.bbox.x1, span.bbox.y1)
+        split_span = span.copy().update_bbox(bbox)
+        split_span.chars = span.chars[0:pos]
+        split_spans.append(split_span)
+
+    if length > 0:
+        bbox = (intsec.x0, intsec.y0, intsec.x1, intsec.y1)
+        split_span = span.copy().update_bbox(bbox)
+        split_span.chars = span.chars[pos:pos_end]
+        split_span._parse_text_format(rect, horizontal)
+        split_spans.append(split_span)
+
+    if pos_end < len(span.chars):
+        if horizontal:
+            bbox = (intsec.x1, span.bbox.y0, span.bbox.x1, span.bbox.y1)
+        else:
+            bbox = (span.bbox.x0, span.bbox.y0, span.bbox.x1, intsec.y0)
+        split_span = span.copy().update_bbox(bbox)
+        split_span.chars = span.chars[pos_end:]
+        split_spans.append(split_span)
+
+    return split_spans
+
+
+def _raw_spans():
+    '''Horizontal spans with chars extracted from sample pdf.'''
+    if not os.path.exists(PDF): return []
+    spans = []
+    with fitz.Document(PDF) as doc:
+        for page in doc:
+            for block in page.get_text('rawdict')['blocks']:
+                for line in block.get('lines', []):
+                    if line['dir']!=(1.0, 0.0): continue
+                    spans.extend(span for span in line['spans'] if len(span['chars'])>=3)
+    return spans
+
+RAW_SPANS = _raw_spans()
+
+
+def _rects(bbox):
+    '''Factories of text style shapes over a span: underline, strike-through and highlight,
+    covering the head, middle, tail or the whole of the span.'''
+    x0, y0, x1, y1 = bbox
+    w, h = x1-x0, y1-y0
+    res = []
+    for a, b in ((0.0, 0.4), (0.3, 0.7), (0.6, 1.0), (-0.1, 1.1), (0.5, 0.5)):
+        u0, u1 = x0+a*w, x0+b*w
+        res.extend([
+            lambda u0=u0, u1=u1: Stroke({'start': (u0, y1), 'end': (u1, y1), 'width': 0.5, 'color': 0xff}),
+            lambda u0=u0, u1=u1: Stroke({'start': (u0, y0+h/2), 'end': (u1, y0+h/2), 'width': 0.5}),
+            lambda u0=u0, u1=u1: Fill({'bbox': (u0, y0, u1, y1), 'color': 0xffff00}),
+        ])
+    return res
+
+
+def _parts(spans:list):
+    return [(span.text, tuple(span.bbox), span.style, span.font, span.size, span.color, span.flags,
+             [(char.c, tuple(char.bbox), char.origin) for char in span.chars]) for span in spans]
+
+
+def _styled(raw:dict):
+    span = TextSpan(raw)
+    span.style.append({'type': 8, 'color': 0}) # e.g. hyperlink parsed already
+    return span
+
+
+@pytest.mark.skipif(not RAW_SPANS, reason='sample pdf not found')
+def test_same_as_copy_for_real_spans():
+    count = 0
+    for raw in RAW_SPANS[::4]: # deep copying all is slow
+        for new_rect in _rects(raw['bbox']):
+            expected = _parts(split_by_copy(_styled(raw), new_rect()))
+
+            span = _styled(raw)
+            original = _parts([span])
+            parts = span.split(new_rect())
+            assert _parts(parts) == expected
+            assert _parts([span]) == original # not changed by splitting
+            count += len(parts)>1
+
+    assert count # spans split into parts indeed
+
+
+def test_parts_style_not_shared():
+    raw = {'bbox': (0, 0, 40, 10), 'font': 'Arial', 'size': 10, 'chars': [
+        {'c': c, 'bbox': (i*10, 0, (i+1)*10, 10), 'origin': (i*10, 9)} for i, c in enumerate('abcd')]}
+    span = TextSpan(raw)
+    left, middle, right = span.split(Stroke({'start': (10, 10), 'end': (30, 10), 'width': 0.5}))
+    assert [part.text for part in (left, middle, right)] == ['a', 'bc', 'd']
+    assert middle.style and not left.style and not right.style and not span.style